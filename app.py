@@ -1,43 +1,63 @@
 import os
+import re
 import time
 import json
+import orjson
 import tempfile
 import traceback
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse, urlunparse
 import subprocess
-import shutil
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import atexit
+import threading
+import zlib
+import hashlib
+import mimetypes
+import logging
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, send_from_directory, Response, send_file, redirect, url_for
+from collections import deque
+from types import SimpleNamespace
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request, jsonify, send_from_directory, Response, send_file, redirect, url_for, render_template, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from cachetools import TTLCache
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from flask_mail import Mail, Message
 from dotenv import load_dotenv
 from openai import OpenAI
 from werkzeug.utils import secure_filename
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from playwright.sync_api import sync_playwright
-from looker_extractor import LookerStudioExtractor
-from bs4 import BeautifulSoup
+from werkzeug.security import safe_join
+from werkzeug.middleware.proxy_fix import ProxyFix
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import FileTarget, ValueTarget
+from io import BytesIO, TextIOWrapper
+from dashboard_browser import DashboardBrowserPool, PdfBrowser
+from looker_extractor import LookerStudioExtractor, wait_for_stable
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
-from models import db, User, Session, ActivityLog, UserStats, log_activity
+from models import db, User, Session, ActivityLog, UserStats, ReportCache, SessionActivityWriter, log_activity, hash_token, ensure_user_stats
+from jobs import JobQueue
+from migrate_hash_tokens import migrate as migrate_hash_tokens
+from scraper_logging import scraper_log
 import resend
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
+VIDEOS_DIR = os.path.join(BASE_DIR, 'static', 'videos')
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "")
 TOPVIEW_API_KEY = os.getenv("TOPVIEW_API_KEY", "")
@@ -45,9 +65,80 @@ TOPVIEW_UID = os.getenv("TOPVIEW_UID", "")
 MODEL_ID = os.getenv("MODEL_ID", "gpt-4o")
 ASSISTANT_ID = os.getenv("ASSISTANT_ID", "")
 PORT = int(os.getenv("PORT", "5173"))
+# Number of waitress worker threads (each in-flight request occupies one)
+WAITRESS_THREADS = int(os.getenv("WAITRESS_THREADS", "16"))
+# Number of background workers for reports requested with async=true
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+# Database connection pool (PostgreSQL): persistent connections per request thread
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(WAITRESS_THREADS)))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Account emails (signup, approval, password reset) are sent by background workers;
+# set EMAIL_SEND_ASYNC=false to send them inside the request instead
+EMAIL_SEND_ASYNC = os.getenv("EMAIL_SEND_ASYNC", "true").lower() == "true"
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "2"))
+EMAIL_JOB_ATTEMPTS = 3  # Tries for queued /api/send-email sends before the job reports failure
+# Number of background workers for Cloudinary uploads requested with async=true
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "2"))
+# Number of dashboards scraped at once (each runs in its own browser)
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "4"))
+# Navigation event to wait for before polling the dashboard for stable content
+SCRAPER_WAIT_UNTIL = os.getenv("SCRAPER_WAIT_UNTIL", "domcontentloaded")
+# Always OCR dashboards, even when tables/metrics can be read from the DOM
+SCRAPER_ALWAYS_OCR = os.getenv("SCRAPER_ALWAYS_OCR", "false").lower() == "true"
+OCR_MIN_DOM_ITEMS = 3  # Tables + metrics + labelled charts a view needs in the DOM to skip its OCR
+# Launch the dashboard browser at startup instead of on the first report
+SCRAPER_PREWARM = os.getenv("SCRAPER_PREWARM", "false").lower() == "true"
+SESSION_ACTIVITY_INTERVAL = 60  # Seconds between last_active updates for a session
+SESSION_FLUSH_INTERVAL = 5  # Seconds between batched session activity writes
+# Seconds without activity before a session stops counting as live (0 disables expiry)
+SESSION_IDLE_TIMEOUT = int(os.getenv("SESSION_IDLE_TIMEOUT", "900"))
+# Reuse a report for the same briefing, file and scraped dashboard/competitor content
+REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", str(7 * 86400)))  # Seconds; 0 disables the cache
+# Per-IP limits for the unauthenticated signup/login/reset endpoints. The default
+# in-memory storage is per process; point RATELIMIT_STORAGE_URI at Redis to share it
+AUTH_RATE_LIMIT = os.getenv("AUTH_RATE_LIMIT", "5 per minute;30 per hour")
+RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+PASSWORD_RESET_INTERVAL = 60  # Seconds before another reset email goes to the same address
+# Reverse proxies in front of the app, so the client IP comes from X-Forwarded-For.
+# Railway's edge proxy is one hop; without it every client shares one rate-limit bucket
+PROXY_HOPS = int(os.getenv("PROXY_HOPS", "1" if os.getenv("RAILWAY_ENVIRONMENT") else "0"))
+# Let a fronting web server send static files: X-Sendfile (Apache, lighttpd) and/or an
+# nginx internal location mapped to the assets directory for X-Accel-Redirect
+USE_X_SENDFILE = os.getenv("USE_X_SENDFILE", "false").lower() == "true"
+ASSETS_ACCEL_PREFIX = os.getenv("ASSETS_ACCEL_PREFIX", "")  # e.g. /internal-assets/
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
+# Status messages go through logging so they cost nothing when the level is off
+logging.basicConfig(
+    level=logging.DEBUG if DEBUG else logging.WARNING,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls', 'pdf', 'txt', 'json'}
+PROFILE_PICTURE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+PROFILE_PICTURE_SIZE = 256  # Max width/height (px) of stored profile pictures
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk when streaming uploads to disk
+# Characters of text kept per competitor/research page, and the cap on bytes
+# downloaded to get them
+FETCH_MAX_CHARS = 5000
+FETCH_MAX_BYTES = 512 * 1024
+# How long the extracted text of competitor/research pages is reused (seconds)
+HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL", "3600"))
+# libx264 preset for lipsync videos that can't be remuxed (faster presets trade size for latency)
+FFMPEG_X264_PRESET = os.getenv("FFMPEG_X264_PRESET", "fast")
+# TopView task polling: first delay, growth per poll and cap (seconds)
+TOPVIEW_POLL_INITIAL = 5
+TOPVIEW_POLL_BACKOFF = 1.5
+TOPVIEW_POLL_MAX = 60
+# Hardware H.264 encoder for those videos: auto (probe NVENC, then VAAPI), nvenc, vaapi or none
+FFMPEG_HW_ENCODER = os.getenv("FFMPEG_HW_ENCODER", "auto").lower()
+VAAPI_DEVICE = os.getenv("VAAPI_DEVICE", "/dev/dri/renderD128")
+# Briefing fields accepted by /api/analyze (besides the data_file upload)
+ANALYZE_FORM_FIELDS = (
+    "brand", "competitors", "competitor_urls", "market", "start_date", "end_date",
+    "objective", "dashboard_links", "research_urls", "hypotheses", "async"
+)
 
 # Email Configuration
 # Resend API (for production/Railway)
@@ -58,17 +149,21 @@ SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_BATCH_SIZE = int(os.getenv("SMTP_BATCH_SIZE", "50"))  # Recipients per SMTP send
 
 # Configure Resend if API key is provided
 if RESEND_API_KEY:
     resend.api_key = RESEND_API_KEY
-    print("✓ Resend API configured")
+    logger.info("✓ Resend API configured")
 
 # Cloudinary Configuration (for hosting media publicly)
 CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME", "")
 CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY", "")
 CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET", "")
 
+CLOUDINARY_CHUNK_SIZE = 6 * 1024 * 1024  # Bytes per chunk for upload_large
+UPLOAD_SPOOL_SIZE = 32 * 1024 * 1024  # Queued uploads stay in memory up to this size
+
 # Initialize Cloudinary if credentials are provided
 if CLOUDINARY_CLOUD_NAME and CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET:
     cloudinary.config(
@@ -76,43 +171,225 @@ if CLOUDINARY_CLOUD_NAME and CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET:
         api_key=CLOUDINARY_API_KEY,
         api_secret=CLOUDINARY_API_SECRET
     )
-    print(f"✓ Cloudinary configured: {CLOUDINARY_CLOUD_NAME}")
+    logger.info("✓ Cloudinary configured: %s", CLOUDINARY_CLOUD_NAME)
 else:
-    print("⚠ Cloudinary not configured - add credentials to .env file")
+    logger.warning("⚠ Cloudinary not configured - add credentials to .env file")
+
+# Initialize OpenAI client on a shared, tuned connection pool (the httpx default
+# of 10 connections throttles concurrent report runs and polls)
+openai_http_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=httpx.Timeout(120.0, connect=5.0)
+)
+client = OpenAI(api_key=OPENAI_API_KEY, http_client=openai_http_client)
+# Interactive chat completions (report edits, scripts) fail fast instead of holding a
+# request thread for the full assistant-run timeout; same client and connection pool
+chat_client = client.with_options(timeout=httpx.Timeout(60.0, connect=5.0))
+
+# Shared HTTP session for other outbound calls (quote page, video downloads),
+# so keep-alive connections and TLS sessions are reused between requests
+http_session = requests.Session()
+http_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=100,
+    max_retries=Retry(total=3, backoff_factor=0.3)  # Idempotent methods only
+)
+http_session.mount('https://', http_adapter)
+http_session.mount('http://', http_adapter)
+
+
+def build_api_session():
+    """Session with its own keep-alive pool for a single API host"""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        # Idempotent methods only; POSTs that start paid work are never retried
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    ))
+    return session
+
+
+# One pool per API, so a burst of TopView polls can't starve ElevenLabs calls.
+# Auth headers are set once here rather than rebuilt for every call
+elevenlabs_session = build_api_session()
+elevenlabs_session.headers["xi-api-key"] = ELEVENLABS_API_KEY
+TTS_HEADERS = {"Accept": "audio/mpeg"}
+topview_session = build_api_session()
+topview_session.headers.update({
+    "Topview-Uid": TOPVIEW_UID,
+    "Authorization": f"Bearer {TOPVIEW_API_KEY}"
+})
+
+# Presigned storage uploads: streamed file bodies can't be replayed, so no automatic retries
+upload_session = requests.Session()
+
+# Separate session for scraping competitor/research pages: browser User-Agent
+# set once, retries on throttling or flaky origin responses
+scrape_session = requests.Session()
+scrape_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+scrape_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+scrape_session.mount('https://', scrape_adapter)
+scrape_session.mount('http://', scrape_adapter)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Covers jsonify() and request.get_json() everywhere. Types orjson can't
+    serialize natively (Decimal, date-likes with __html__, ...) fall back to
+    Flask's default handler. Keys are not sorted and output is compact.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 # Initialize Flask app
 app = Flask(__name__, static_url_path="", static_folder="static")
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for API calls
+if PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS, x_proto=PROXY_HOPS)
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
+app.config['USE_X_SENDFILE'] = USE_X_SENDFILE
 
 # Database & Authentication Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///supa_reports.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgres'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        # One pooled connection per waitress thread, with overflow for the
+        # background workers (reports, emails, session activity writer)
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_pre_ping': True,  # Drop connections the server closed while idle
+        'pool_recycle': 1800,
+        # Let psycopg2 batch executemany() INSERTs/UPDATEs into a few round-trips
+        'executemany_mode': 'values_plus_batch',
+        'insertmanyvalues_page_size': 1000,
+        'executemany_batch_page_size': 500
+    }
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(seconds=int(os.getenv('PERMANENT_SESSION_LIFETIME', 86400)))
 
-# Flask-Mail Configuration
-app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
-app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS', 'True').lower() == 'true'
-app.config['MAIL_USERNAME'] = os.getenv('SMTP_USERNAME', '')
-app.config['MAIL_PASSWORD'] = os.getenv('SMTP_PASSWORD', '')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER', 'supachatglobal@gmail.com')
+# Response compression (report JSON from /api/analyze is tens to hundreds of KB)
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 1024
 
 # Initialize extensions
 db.init_app(app)
-mail = Mail(app)
+Compress(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+# Rejects abusive auth traffic before any password hashing, DB or mail work
+limiter = Limiter(get_remote_address, app=app, storage_uri=RATELIMIT_STORAGE_URI)
+
+# Addresses that were sent a reset email recently
+password_reset_cache = TTLCache(maxsize=10000, ttl=PASSWORD_RESET_INTERVAL)
+password_reset_cache_lock = threading.Lock()
+
+# Recently loaded users, kept detached so each request works on its own copy
+user_cache = TTLCache(maxsize=10000, ttl=60)
+user_cache_lock = threading.Lock()
+
 # User loader for Flask-Login
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    with user_cache_lock:
+        cached = user_cache.get(user_id)
+
+    if cached is None:
+        cached = db.session.get(User, user_id)
+        if cached is None:
+            return None
+        db.session.expunge(cached)
+        with user_cache_lock:
+            user_cache[user_id] = cached
+
+    # Attach a per-request copy without issuing a SELECT
+    return db.session.merge(cached, load=False)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, user):
+    """Drop a user from the loader cache whenever their row changes"""
+    with user_cache_lock:
+        user_cache.pop(user.id, None)
+
+# /api/auth/session-info payloads per user; admin payloads carry the all-user report
+# total, so any stats change drops them all. The live session count is shared by everyone
+SESSION_INFO_CACHE_TTL = 30
+LIVE_SESSIONS_CACHE_TTL = 10
+session_info_cache = TTLCache(maxsize=10000, ttl=SESSION_INFO_CACHE_TTL)
+admin_session_info_cache = TTLCache(maxsize=100, ttl=SESSION_INFO_CACHE_TTL)
+live_sessions_cache = TTLCache(maxsize=1, ttl=LIVE_SESSIONS_CACHE_TTL)
+session_info_cache_lock = threading.Lock()
+
+
+@event.listens_for(UserStats, 'after_insert')
+@event.listens_for(UserStats, 'after_update')
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_session_info(mapper, connection, target):
+    """Drop cached session info when a user's profile or stats change"""
+    user_id = target.user_id if isinstance(target, UserStats) else target.id
+    with session_info_cache_lock:
+        session_info_cache.pop(user_id, None)
+        if isinstance(target, UserStats):
+            admin_session_info_cache.clear()
+        else:
+            admin_session_info_cache.pop(user_id, None)
+
+
+def get_live_session_count():
+    """Number of active sessions, cached briefly and shared across users"""
+    with session_info_cache_lock:
+        count = live_sessions_cache.get('live_sessions')
+    if count is None:
+        count = Session.query.filter_by(is_active=True).count()
+        with session_info_cache_lock:
+            live_sessions_cache['live_sessions'] = count
+    return count
+
+# Serialized /api/auth/online-users response shared by every poller for a few seconds
+ONLINE_USERS_CACHE_TTL = 15
+online_users_cache = TTLCache(maxsize=1, ttl=ONLINE_USERS_CACHE_TTL)
+online_users_cache_lock = threading.Lock()
+
+
+@event.listens_for(Session, 'after_insert')
+@event.listens_for(Session, 'after_update')
+def invalidate_online_users(mapper, connection, session):
+    """Rebuild the online users list after a login or logout"""
+    with online_users_cache_lock:
+        online_users_cache.clear()
 
 # Admin decorator
 def admin_required(f):
@@ -150,8 +427,19 @@ def send_email_via_resend(from_email, to_emails, subject, html_content):
         print(f"Resend error: {str(e)}")
         return False, str(e)
 
-def send_email_via_smtp(from_email, to_emails, subject, html_content):
-    """Send email using SMTP (fallback for local development)"""
+def send_email_via_smtp(from_email, to_emails, subject, html_content, sent=None):
+    """
+    Send email using SMTP (fallback for local development)
+
+    Args:
+        sent: Optional list the recipients of each delivered batch are appended
+            to, so a failed send can be retried for the remaining ones only
+    """
+    # Only needed when Resend isn't configured, so not loaded at startup
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    from smtp_pool import get_smtp_pool
+
     try:
         smtp_user = SMTP_USERNAME if SMTP_USERNAME else from_email
         smtp_pass = SMTP_PASSWORD
@@ -159,39 +447,39 @@ def send_email_via_smtp(from_email, to_emails, subject, html_content):
         if not smtp_pass:
             return False, "SMTP credentials not configured"
 
+        if isinstance(to_emails, str):
+            to_emails = [to_emails]
+
         # Create message
         msg = MIMEMultipart('alternative')
         msg['From'] = from_email
-        msg['To'] = ', '.join(to_emails) if isinstance(to_emails, list) else to_emails
+        msg['To'] = ', '.join(to_emails)
         msg['Subject'] = subject
 
         # Attach HTML content
         html_part = MIMEText(html_content, 'html')
         msg.attach(html_part)
 
-        # Try port 587 with STARTTLS first, fallback to port 465 with SSL
-        try:
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=10) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
-            print(f"✓ Email sent via SMTP port {SMTP_PORT}")
-            return True, "Email sent via SMTP"
-        except (smtplib.SMTPException, TimeoutError, OSError) as smtp_error:
-            print(f"Port {SMTP_PORT} failed, trying SSL on port 465...")
-            with smtplib.SMTP_SSL(SMTP_SERVER, 465, timeout=10) as server:
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
-            print("✓ Email sent via SMTP SSL port 465")
-            return True, "Email sent via SMTP SSL"
+        # Logged-in connections are reused across sends (STARTTLS on SMTP_PORT,
+        # falling back to SSL on 465), and recipients go out in batches per send
+        pool = get_smtp_pool(SMTP_SERVER, SMTP_PORT, smtp_user, smtp_pass)
+        for i in range(0, len(to_emails), SMTP_BATCH_SIZE):
+            batch = to_emails[i:i + SMTP_BATCH_SIZE]
+            pool.send(msg, from_email, batch)
+            if sent is not None:
+                sent.extend(batch)
+        print(f"✓ Email sent via SMTP to {len(to_emails)} recipient(s)")
+        return True, "Email sent via SMTP"
     except Exception as e:
         print(f"SMTP error: {str(e)}")
         return False, str(e)
 
-def send_email_helper(from_email, to_emails, subject, html_content):
+def send_email_helper(from_email, to_emails, subject, html_content, sent=None):
     """
     Unified email sending function.
     Uses Resend if configured, falls back to SMTP for local development.
+    SMTP sends in batches; pass a list as sent to collect the recipients
+    already delivered to when a later batch fails.
     """
     # Ensure to_emails is a list
     if isinstance(to_emails, str):
@@ -208,39 +496,145 @@ def send_email_helper(from_email, to_emails, subject, html_content):
 
     # Fall back to SMTP
     if SMTP_PASSWORD:
-        return send_email_via_smtp(from_email, to_emails, subject, html_content)
+        return send_email_via_smtp(from_email, to_emails, subject, html_content, sent)
 
     # No email service configured
     return False, "No email service configured (need RESEND_API_KEY or SMTP credentials)"
 
+def deliver_email(from_email, to_emails, subject, html_content, description):
+    """Send an email and log the outcome (runs on the email workers)"""
+    success, result = send_email_helper(from_email, to_emails, subject, html_content)
+    if success:
+        print(f"✓ {description} sent to: {', '.join(to_emails)}")
+    else:
+        print(f"Warning: Could not send {description.lower()}: {result}")
+    return success
+
+def send_email_job(from_email, to_emails, subject, html_content, attempts=1):
+    """
+    Send an /api/send-email message, retrying failed sends with backoff.
+
+    Retries only go to the recipients that haven't been delivered to yet, so
+    batches that already went out over SMTP aren't sent twice.
+
+    Returns:
+        Dict with the status_code and JSON body of the /api/send-email response
+    """
+    if isinstance(to_emails, str):
+        to_emails = [to_emails]
+
+    sent = []
+    for attempt in range(attempts):
+        remaining = [email for email in to_emails if email not in sent]
+        success, result = send_email_helper(from_email, remaining, subject, html_content, sent)
+        if success:
+            return {
+                "status_code": 200,
+                "body": {
+                    "success": True,
+                    "message": f"Email sent to {len(to_emails)} recipient(s)",
+                    "recipients": to_emails
+                }
+            }
+        if attempt + 1 < attempts:
+            time.sleep(2 ** attempt)
+
+    body = {
+        "error": "Failed to send email",
+        "message": result,
+        "details": result
+    }
+    if sent:
+        # Partial failure: report who got it instead of hiding it in the error
+        body["sent_to"] = sent
+        body["failed_recipients"] = [email for email in to_emails if email not in sent]
+    return {"status_code": 500, "body": body}
+
+def queue_email(from_email, to_emails, subject, html_content, description):
+    """
+    Send an account email without making the request wait on Resend/SMTP.
+
+    Args:
+        from_email: Sender address
+        to_emails: List of recipient addresses
+        subject: Email subject
+        html_content: HTML body
+        description: What the email is, for log messages (e.g. "Approval email")
+
+    Returns:
+        Job ID of the queued send, or None if it was sent inline (EMAIL_SEND_ASYNC=false)
+    """
+    if not EMAIL_SEND_ASYNC:
+        deliver_email(from_email, to_emails, subject, html_content, description)
+        return None
+    return email_jobs.submit(deliver_email, from_email, to_emails, subject, html_content, description)
+
 # Update session activity on every request
 @app.before_request
 def update_session_activity():
     """Update the current user's session last_active timestamp"""
     if current_user.is_authenticated:
-        try:
-            # Get the user's active session
-            active_session = current_user.get_active_session()
-            if active_session:
-                active_session.last_active = datetime.utcnow()
-                db.session.commit()
-        except Exception as e:
-            # Don't let session update errors break the request
-            db.session.rollback()
-            print(f"Error updating session activity: {e}")
+        # Tracked in memory and written to the sessions table in batches;
+        # no database round-trip on the request path
+        session_activity_writer.touch(current_user.id)
 
 # Create database tables
 with app.app_context():
     db.create_all()
-    print("✓ Database initialized")
+    # create_all() doesn't add columns to existing tables: bring databases created
+    # before tokens were hashed up to date (no-op once done)
+    if not migrate_hash_tokens(db.engine, log=logger.info):
+        raise RuntimeError("Token hash migration failed, see migrate_hash_tokens.py")
+    logger.info("✓ Database initialized")
+
+# Background writer for session last_active bumps (flushed on exit too)
+session_activity_writer = SessionActivityWriter(
+    app,
+    flush_interval=SESSION_FLUSH_INTERVAL,
+    min_interval=SESSION_ACTIVITY_INTERVAL,
+    idle_timeout=SESSION_IDLE_TIMEOUT
+)
+atexit.register(session_activity_writer.flush)
+
+# Shared Playwright browsers for dashboard scraping (each launched on first use)
+dashboard_browsers = DashboardBrowserPool(BASE_DIR, size=SCRAPER_CONCURRENCY)
+atexit.register(dashboard_browsers.close)
+if SCRAPER_PREWARM:
+    dashboard_browsers.warm_up()
+
+# Headless Chromium used to print PDF exports (launched on first export)
+pdf_browser = PdfBrowser()
+atexit.register(pdf_browser.close)
+
+# Worker pool for report generation requested with async=true
+report_jobs = JobQueue('report', max_workers=REPORT_WORKERS)
+email_jobs = JobQueue('email', max_workers=EMAIL_WORKERS)
+upload_jobs = JobQueue('upload', max_workers=UPLOAD_WORKERS)
+
+# Threads for the scrape/fetch steps of each report (two per in-flight report)
+report_io_pool = ThreadPoolExecutor(
+    max_workers=2 * (WAITRESS_THREADS + REPORT_WORKERS),
+    thread_name_prefix='report-io'
+)
+
+# Threads for the image + audio TopView uploads of each lipsync request
+topview_upload_pool = ThreadPoolExecutor(
+    max_workers=2 * WAITRESS_THREADS,
+    thread_name_prefix='topview-upload'
+)
 
 # Create logs directory
-LOGS_DIR = os.path.join(os.path.dirname(__file__), 'logs')
+LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 os.makedirs(LOGS_DIR, exist_ok=True)
-USAGE_LOG_FILE = os.path.join(LOGS_DIR, 'usage_log.json')
+USAGE_LOG_FILE = os.path.join(LOGS_DIR, 'usage_log.jsonl')  # One JSON event per line
+usage_log_lock = threading.Lock()
+usage_buffer = deque()  # Pending usage events, flushed by usage_log_flusher
+usage_flush_event = threading.Event()
+USAGE_FLUSH_INTERVAL = 5  # Seconds between usage log flushes
+USAGE_FLUSH_BATCH = 2000  # Flush early once this many events are pending
 
 # Create uploads directory for profile pictures
-UPLOADS_DIR = os.path.join(os.path.dirname(__file__), 'static', 'uploads', 'profiles')
+UPLOADS_DIR = os.path.join(BASE_DIR, 'static', 'uploads', 'profiles')
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
 # ============================================================================
@@ -407,6 +801,39 @@ Azi's mission is to deliver **Supa Reports** that move from *data to insight to
 Each report should read like a strategic debrief from a senior marketing planner — insightful, grounded in real performance, and focused on helping the brand grow through smarter creative, smarter targeting, and smarter media investment.
 """
 
+# Per-run directive, sent as additional_instructions so the assistant's
+# SYSTEM_PROMPT stays the unchanged (and cacheable) prompt prefix
+REPORT_RUN_INSTRUCTIONS = (
+    "CRITICAL: Analyze data from three sources: "
+    "1) Uploaded files using file_search + code_interpreter, "
+    "2) Scraped dashboard data provided in the briefing (tables, metrics, KPIs), "
+    "3) Competitor and research insights extracted from provided URLs. "
+    "Dashboard data is automatically extracted via browser automation and included in your context. "
+    "Competitor/research insights are fetched and analyzed from the URLs provided in the briefing. "
+    "If none of these data sources are available, state this clearly and do NOT fabricate metrics. "
+    "NEVER make up numbers for impressions, clicks, CTR, conversions, or any performance data. "
+    "Use the competitor insights to provide context, benchmarking, and competitive analysis. "
+    "Respond strictly in output_schema JSON format with actual data from available sources."
+)
+
+# System prompts for report follow-ups. Keep these free of per-request
+# content so every call shares the same cached prefix.
+CHAT_MODIFY_SYSTEM_PROMPT = """You are an AI assistant helping to modify marketing analysis reports.
+You will receive a JSON report and a modification request from the user.
+Your task is to modify the report according to the request while maintaining the exact JSON structure.
+
+CRITICAL RULES:
+1. Maintain the EXACT same JSON structure
+2. Keep all section names: audience, media, creative, conversion, competitive, optimization, bonus, citations
+3. Each section (except bonus and citations) must have: key_findings, supporting_data, research_context, implications, actions
+4. Only modify content relevant to the user's request
+5. Return ONLY valid JSON, no explanations"""
+
+SCRIPT_SYSTEM_PROMPT = """You are a creative scriptwriter specializing in marketing and brand content.
+Your task is to create engaging scripts from marketing analysis reports.
+The scripts should be clear, concise, and suitable for video, audio, or presentation formats.
+Focus on the most impactful insights and make them audience-friendly."""
+
 # ============================================================================
 # OUTPUT SCHEMA
 # ============================================================================
@@ -451,6 +878,10 @@ OUTPUT_SCHEMA = {
         "name": "azi_analysis_output",
         "strict": True,
         "schema": {
+            # Shared definition for the six analysis sections, referenced via $ref
+            "$defs": {
+                "section_block": SECTION_BLOCK_SCHEMA
+            },
             "type": "object",
             "required": [
                 "audience",
@@ -463,12 +894,12 @@ OUTPUT_SCHEMA = {
                 "citations"
             ],
             "properties": {
-                "audience": SECTION_BLOCK_SCHEMA,
-                "media": SECTION_BLOCK_SCHEMA,
-                "creative": SECTION_BLOCK_SCHEMA,
-                "conversion": SECTION_BLOCK_SCHEMA,
-                "competitive": SECTION_BLOCK_SCHEMA,
-                "optimization": SECTION_BLOCK_SCHEMA,
+                "audience": {"$ref": "#/$defs/section_block"},
+                "media": {"$ref": "#/$defs/section_block"},
+                "creative": {"$ref": "#/$defs/section_block"},
+                "conversion": {"$ref": "#/$defs/section_block"},
+                "competitive": {"$ref": "#/$defs/section_block"},
+                "optimization": {"$ref": "#/$defs/section_block"},
                 "bonus": {
                     "type": "object",
                     "required": ["one_sentence", "key_takeaway", "unexpected_learning"],
@@ -502,52 +933,155 @@ OUTPUT_SCHEMA = {
     }
 }
 
+# Serialized once at import; identifies the prompt + schema version in report cache keys
+OUTPUT_SCHEMA_JSON = json.dumps(OUTPUT_SCHEMA, sort_keys=True, separators=(',', ':'))
+REPORT_PROMPT_FINGERPRINT = hashlib.sha256(
+    '\n'.join([MODEL_ID, SYSTEM_PROMPT, REPORT_RUN_INSTRUCTIONS, OUTPUT_SCHEMA_JSON]).encode('utf-8')
+).hexdigest()
+
 # ============================================================================
 # USAGE LOGGING
 # ============================================================================
 
 def log_usage(event_type, data):
     """
-    Log usage events to JSON file for tracking and analytics.
+    Queue a usage event for the JSON Lines log used for tracking and analytics.
+
+    Events are buffered in memory and written in batches by a background
+    thread, so logging never blocks the request on disk I/O.
 
     Args:
         event_type: Type of event (e.g., 'report_generation', 'video_generation')
         data: Dictionary with event-specific data
     """
     try:
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'event_type': event_type,
-            **data
-        }
+        # Only grab the raw clock here; ISO formatting happens in the flusher
+        usage_buffer.append((time.time(), event_type, data))
+        if len(usage_buffer) >= USAGE_FLUSH_BATCH:
+            usage_flush_event.set()
 
-        # Read existing logs
-        logs = []
-        if os.path.exists(USAGE_LOG_FILE):
-            try:
-                with open(USAGE_LOG_FILE, 'r') as f:
-                    logs = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                logs = []
+    except Exception as e:
+        logger.error("Error logging usage: %s", e)
+        # Don't fail the request if logging fails
+
+
+def flush_usage_log():
+    """Append all buffered usage events to the log file in one write."""
+    entries = []
+    while usage_buffer:
+        entries.append(usage_buffer.popleft())
+    if not entries:
+        return
+
+    try:
+        lines = ''.join(
+            json.dumps({
+                'timestamp': datetime.fromtimestamp(logged_at).isoformat(),
+                'event_type': event_type,
+                **data
+            }, separators=(',', ':')) + '\n'
+            for logged_at, event_type, data in entries
+        )
+        with usage_log_lock:
+            with open(USAGE_LOG_FILE, 'a') as f:
+                f.write(lines)
+        logger.info("✓ Logged %d usage event(s)", len(entries))
+    except Exception as e:
+        logger.error("Error writing usage log: %s", e)
 
-        # Append new log entry
-        logs.append(log_entry)
 
-        # Write back to file
-        with open(USAGE_LOG_FILE, 'w') as f:
-            json.dump(logs, f, indent=2)
+def usage_log_flusher():
+    """Flush the usage buffer every few seconds, or sooner when it fills up."""
+    while True:
+        usage_flush_event.wait(USAGE_FLUSH_INTERVAL)
+        usage_flush_event.clear()
+        flush_usage_log()
+
+
+threading.Thread(target=usage_log_flusher, name='usage-log-flusher', daemon=True).start()
+atexit.register(flush_usage_log)
+
+
+# ============================================================================
+# REPORT CACHE
+# ============================================================================
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-        print(f"✓ Logged {event_type} event")
 
+def report_cache_key(briefing, competitor_urls, file_hash=None, scraped=None):
+    """
+    Build a deterministic cache key for a report request.
+
+    Covers the model, prompt, output schema, every user-supplied input and the
+    scraped dashboard/competitor content, so any change to them (including
+    new data on a live dashboard) produces a fresh generation.
+    """
+    key_source = orjson.dumps({
+        'prompt': REPORT_PROMPT_FINGERPRINT,
+        'briefing': briefing,
+        'competitor_urls': competitor_urls,
+        'file_hash': file_hash,
+        'scraped': scraped
+    }, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(key_source).hexdigest()
+
+
+def get_cached_report(cache_key):
+    """Return a cached report response body, or None on a miss or expiry."""
+    if REPORT_CACHE_TTL <= 0:
+        return None
+    try:
+        entry = db.session.get(ReportCache, cache_key)
+        if not entry:
+            return None
+        if entry.expires_at < datetime.utcnow():
+            db.session.delete(entry)
+            db.session.commit()
+            return None
+        return orjson.loads(zlib.decompress(entry.payload))
     except Exception as e:
-        print(f"Error logging usage: {str(e)}")
-        # Don't fail the request if logging fails
+        db.session.rollback()
+        logger.error("Error reading report cache: %s", e)
+        return None
+
+
+def store_cached_report(cache_key, body):
+    """Store a successful report response body in the cache."""
+    if REPORT_CACHE_TTL <= 0:
+        return
+    try:
+        payload = zlib.compress(orjson.dumps(body))
+        db.session.merge(ReportCache(
+            cache_key=cache_key,
+            payload=payload,
+            created_at=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(seconds=REPORT_CACHE_TTL)
+        ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Error writing report cache: %s", e)
+        # Don't fail the request if caching fails
 
 
 # ============================================================================
 # PLAYWRIGHT DASHBOARD SCRAPING
 # ============================================================================
 
+# Separators used in the text summaries sent to the assistant
+SECTION_RULE = "=" * 80
+ITEM_RULE = "-" * 80
+
+# Line break plus any surrounding whitespace/blank lines in scraped page text
+LINE_BREAK_RE = re.compile(r'\s*[\r\n]\s*')
+
 def analyze_dashboards_with_playwright(dashboard_urls):
     """
     Use Playwright to navigate and extract insights from dashboard URLs.
@@ -558,175 +1092,102 @@ def analyze_dashboards_with_playwright(dashboard_urls):
         dashboard_urls: List of dashboard URLs to analyze
 
     Returns:
-        Dictionary with extracted data from each dashboard
+        Tuple of (dictionary with extracted data from each dashboard,
+        whether every dashboard was scraped successfully)
     """
     if not dashboard_urls or len(dashboard_urls) == 0:
-        return {}
+        return {}, True
 
     try:
-        print(f"🌐 Scraping {len(dashboard_urls)} dashboard(s) with Playwright...")
+        scraper_log.info("🌐 Scraping %s dashboard(s) with Playwright...", len(dashboard_urls))
 
-        dashboard_insights = {}
+        # Dashboards are scraped side by side, one per free browser in the pool
+        total = len(dashboard_urls)
+        jobs = [(idx, total, url) for idx, url in enumerate(dashboard_urls, 1)]
+        results = dashboard_browsers.map(scrape_dashboard, jobs)
+        dashboard_insights = {url: summary for url, (summary, _) in zip(dashboard_urls, results)}
 
-        # Check for existing browser authentication data
-        # Supports multiple browsers (firefox, chromium, webkit)
-        base_dir = os.path.dirname(__file__)
-        auth_dirs = {
-            'firefox': os.path.join(base_dir, 'browser_data_firefox'),
-            'chromium': os.path.join(base_dir, 'browser_data_chromium'),
-            'webkit': os.path.join(base_dir, 'browser_data_webkit'),
-        }
+        scraper_log.info("✓ Completed dashboard scraping: %s processed", len(dashboard_insights))
+        return dashboard_insights, all(success for _, success in results)
 
-        # Find which browser has authentication data
-        browser_type = None
-        auth_dir = None
-        for btype, bdir in auth_dirs.items():
-            if os.path.exists(bdir) and os.listdir(bdir):
-                browser_type = btype
-                auth_dir = bdir
-                print(f"  ℹ️ Found {btype.capitalize()} authentication data")
-                break
+    except Exception as e:
+        scraper_log.exception("Error in Playwright dashboard scraping: %s", e)
+        return {}, False
 
-        # If no auth data found, default to Chromium
-        if not browser_type:
-            browser_type = 'chromium'
-            auth_dir = auth_dirs['chromium']
-            print(f"  ℹ️ No authentication found, using {browser_type.capitalize()} (headless)")
-
-        os.makedirs(auth_dir, exist_ok=True)
-
-        with sync_playwright() as p:
-            # Select the browser
-            if browser_type == 'firefox':
-                browser_engine = p.firefox
-            elif browser_type == 'webkit':
-                browser_engine = p.webkit
-            else:  # chromium
-                browser_engine = p.chromium
-
-            # Browser arguments to bypass Google's automation detection
-            browser_args = [
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process',
-                '--disable-site-isolation-trials'
-            ]
-
-            # Use persistent context to maintain Google authentication
-            # This allows the user to log in once and reuse the session
-            # Can use headless mode since authentication is already saved
-            headless_mode = os.getenv('SCRAPER_HEADLESS', 'true').lower() == 'true'
 
-            try:
-                context = browser_engine.launch_persistent_context(
-                    auth_dir,
-                    headless=headless_mode,  # Use headless by default (can be changed in .env)
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    locale='en-US',
-                    args=browser_args if browser_type == 'chromium' else []
-                )
+def scrape_dashboard(page, job):
+    """
+    Scrape a single dashboard on a browser page from the pool.
 
-                print(f"  ℹ️ Using persistent {browser_type.capitalize()} context (headless={headless_mode})")
+    Args:
+        page: Playwright page owned by the calling browser thread
+        job: Tuple of (position, total dashboards, dashboard URL)
 
-            except Exception as e:
-                print(f"  ⚠️ Could not create persistent context: {e}")
-                print(f"  ℹ️ Falling back to non-persistent mode")
-                # Fallback to regular browser if persistent context fails
-                browser = browser_engine.launch(
-                    headless=True,
-                    args=browser_args if browser_type == 'chromium' else []
-                )
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    locale='en-US'
-                )
+    Returns:
+        Tuple of (text summary of the extracted data or an error message,
+        whether the scrape succeeded)
+    """
+    # Imported here so request paths that never scrape don't load Playwright
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    idx, total, url = job
+    try:
+        scraper_log.info("  [%s/%s] Scraping: %s...", idx, total, url[:60])
+
+        # Navigate to the dashboard
+        scraper_log.info("     Navigating to dashboard...")
+        # Avoid 'networkidle' by default - Looker dashboards continuously fetch data
+        # and may never reach a true networkidle state
+        # Uses the context's short default navigation timeout; a slow dashboard
+        # is extracted from whatever has loaded rather than stalling the batch
+        try:
+            page.goto(url, wait_until=SCRAPER_WAIT_UNTIL)
+        except PlaywrightTimeoutError:
+            scraper_log.warning("  ⚠️ Navigation timed out, extracting whatever loaded")
+
+        # Let client-side rendering (and any login redirect) settle
+        wait_for_stable(page)
+
+        # Check if we hit a login page or session expired
+        if 'accounts.google.com' in page.url:
+            scraper_log.error("  ❌ ERROR: Session has expired or is invalid.")
+            scraper_log.info("  ℹ️ Please run authentication setup again:")
+            scraper_log.info("      python3 setup_google_auth.py %s", dashboard_browsers.browser_type)
+            return "Error: Session expired. Please run setup_google_auth.py again.", False
+
+        scraper_log.info("     Successfully loaded dashboard")
+        scraper_log.info("     Dashboard Title: %s", page.title())
+
+        # Create extractor instance
+        extractor = LookerStudioExtractor(page)
+
+        # Extract all data with navigation exploration, using OCR for canvas/images
+        # unless the dashboard already exposes its data in the DOM
+        dashboard_data = extractor.extract_all_data(
+            explore_nav=True,
+            enable_scrolling=True,
+            enable_ocr=True,
+            ocr_min_dom_items=None if SCRAPER_ALWAYS_OCR else OCR_MIN_DOM_ITEMS
+        )
+
+        # Format the extracted data as a text summary for OpenAI
+        summary_text = format_dashboard_data_as_text(dashboard_data)
 
-            # Use existing page if available (persistent context may have one already)
-            page = context.pages[0] if context.pages else context.new_page()
-
-            # Remove webdriver property to hide automation
-            page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                });
-            """)
-
-            for idx, url in enumerate(dashboard_urls, 1):
-                try:
-                    print(f"  [{idx}/{len(dashboard_urls)}] Scraping: {url[:60]}...")
-
-                    # Navigate to the dashboard
-                    print(f"     Navigating to dashboard...")
-                    # Use 'load' instead of 'networkidle' - Looker dashboards continuously fetch data
-                    # and may never reach a true networkidle state
-                    page.goto(url, wait_until='load', timeout=60000)  # 60 second timeout
-
-                    # Add realistic delay to avoid detection
-                    time.sleep(5)
-
-                    # Check if we hit a login page or session expired
-                    if 'accounts.google.com' in page.url:
-                        print(f"  ❌ ERROR: Session has expired or is invalid.")
-                        print(f"  ℹ️ Please run authentication setup again:")
-                        print(f"      python3 setup_google_auth.py {browser_type}")
-                        dashboard_insights[url] = "Error: Session expired. Please run setup_google_auth.py again."
-                        continue
-
-                    print(f"     Successfully loaded dashboard")
-                    print(f"     Dashboard Title: {page.title()}")
-
-                    # Create extractor instance
-                    extractor = LookerStudioExtractor(page)
-
-                    # Extract all data with navigation exploration and OCR enabled
-                    dashboard_data = extractor.extract_all_data(
-                        explore_nav=True,
-                        enable_scrolling=True,
-                        enable_ocr=True  # Enable OCR to extract data from canvas/images
-                    )
-
-                    # Format the extracted data as a text summary for OpenAI
-                    summary_text = format_dashboard_data_as_text(dashboard_data)
-
-                    dashboard_insights[url] = summary_text
-                    print(f"  ✓ Successfully scraped dashboard {idx}")
-                    print(f"     Extracted: {dashboard_data['summary']['total_tables']} tables, "
-                          f"{dashboard_data['summary']['total_metrics']} metrics, "
-                          f"{dashboard_data['summary']['total_charts']} charts")
-
-                except Exception as e:
-                    print(f"  ✗ Error scraping dashboard {idx}: {str(e)}")
-                    dashboard_insights[url] = f"Error: Could not scrape dashboard - {str(e)}"
-
-            context.close()
-
-        print(f"✓ Completed dashboard scraping: {len(dashboard_insights)} processed")
-        return dashboard_insights
+        scraper_log.info("  ✓ Successfully scraped dashboard %s", idx)
+        summary = dashboard_data['summary']
+        scraper_log.info("     Extracted: %s tables, %s metrics, %s charts",
+                         summary['total_tables'], summary['total_metrics'], summary['total_charts'])
+        return summary_text, True
 
     except Exception as e:
-        print(f"Error in Playwright dashboard scraping: {str(e)}")
-        traceback.print_exc()
-        return {}
+        scraper_log.error("  ✗ Error scraping dashboard %s: %s", idx, e)
+        return f"Error: Could not scrape dashboard - {str(e)}", False
+
+
+# Extracted text of successfully fetched pages, by URL, so re-analyzed URLs skip
+# the network. Only the truncated result is kept, never the raw response body
+page_content_cache = TTLCache(maxsize=1000, ttl=HTTP_CACHE_TTL)
+page_content_cache_lock = threading.Lock()
 
 
 def fetch_url_content(url, timeout=10):
@@ -740,48 +1201,67 @@ def fetch_url_content(url, timeout=10):
     Returns:
         Dictionary with URL, title, and extracted text
     """
-    try:
-        print(f"  Fetching URL: {url}")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    from lxml import html as lxml_html
 
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
+    with page_content_cache_lock:
+        cached = page_content_cache.get(url)
+    if cached is not None:
+        scraper_log.info("  ✓ Using cached copy of %s", url)
+        return cached
 
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+    try:
+        scraper_log.info("  Fetching URL: %s", url)
+        with scrape_session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+
+            # Only download as much of the page as we could ever use
+            raw = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                raw += chunk
+                if len(raw) >= FETCH_MAX_BYTES:
+                    del raw[FETCH_MAX_BYTES:]
+                    break
+
+            # Trust the declared charset only; otherwise let lxml read the <meta> tag
+            content_type = response.headers.get('Content-Type', '').lower()
+            encoding = response.encoding if 'charset' in content_type else None
+
+        # Parse HTML (lxml recovers from the truncated tail)
+        parser = lxml_html.HTMLParser(encoding=encoding, remove_comments=True)
+        doc = lxml_html.document_fromstring(bytes(raw), parser=parser)
 
         # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
+        for element in doc.xpath('//script|//style|//nav|//footer|//header'):
+            element.drop_tree()
 
         # Get title
-        title = soup.title.string if soup.title else url
+        title = (doc.findtext('.//title') or '').strip() or url
 
         # Get text content
-        text = soup.get_text(separator='\n', strip=True)
+        text = '\n'.join(doc.itertext())
 
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        text = '\n'.join(line for line in lines if line)
+        # Clean up whitespace: strip every line and drop blank ones in one pass
+        text = LINE_BREAK_RE.sub('\n', text).strip()
 
         # Limit text length to avoid overwhelming context
-        max_chars = 5000
-        if len(text) > max_chars:
-            text = text[:max_chars] + f"\n\n... (truncated, {len(text) - max_chars} more characters)"
+        text_len = len(text)
+        if text_len > FETCH_MAX_CHARS:
+            text = f"{text[:FETCH_MAX_CHARS]}\n\n... (truncated, {text_len - FETCH_MAX_CHARS} more characters)"
 
-        print(f"  ✓ Fetched {len(text)} characters from: {title}")
+        scraper_log.info("  ✓ Fetched %s characters from: %s", len(text), title)
 
-        return {
+        result = {
             'url': url,
             'title': title,
             'text': text,
             'success': True
         }
+        with page_content_cache_lock:
+            page_content_cache[url] = result
+        return result
 
     except Exception as e:
-        print(f"  ✗ Error fetching {url}: {str(e)}")
+        scraper_log.error("  ✗ Error fetching %s: %s", url, e)
         return {
             'url': url,
             'error': str(e),
@@ -789,6 +1269,20 @@ def fetch_url_content(url, timeout=10):
         }
 
 
+def normalize_url(url):
+    """Canonical form of a URL for deduplication: lowercase scheme/host, no trailing slash or fragment"""
+    parts = urlparse(url.strip())
+    return urlunparse((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'),
+        parts.params, parts.query, ''
+    ))
+
+
+def dedupe_urls(urls):
+    """Normalized URLs with duplicates dropped, first occurrence order kept"""
+    return list(dict.fromkeys(normalize_url(url) for url in urls if url))
+
+
 def fetch_competitor_insights(competitor_urls):
     """
     Fetch content from competitor URLs and return formatted text.
@@ -797,44 +1291,52 @@ def fetch_competitor_insights(competitor_urls):
         competitor_urls: List of competitor URLs
 
     Returns:
-        Formatted string with competitor insights
+        Tuple of (formatted string with competitor insights,
+        whether every URL was fetched successfully)
     """
     if not competitor_urls:
-        return ""
+        return "", True
 
-    print(f"\n📊 Fetching competitor insights from {len(competitor_urls)} URLs...")
+    scraper_log.info("\n📊 Fetching competitor insights from %s URLs...", len(competitor_urls))
 
-    results = []
-    for url in competitor_urls[:5]:  # Limit to 5 URLs to avoid timeout
-        result = fetch_url_content(url)
-        results.append(result)
+    # Limit to 5 URLs to avoid timeout; fetch them in parallel (results keep URL order)
+    urls = competitor_urls[:5]
+    with ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix='competitor-fetch') as executor:
+        results = list(executor.map(fetch_url_content, urls))
 
     # Format results
-    lines = []
-    lines.append("=" * 80)
-    lines.append("COMPETITOR & RESEARCH INSIGHTS")
-    lines.append("=" * 80)
-    lines.append("")
+    lines = [SECTION_RULE, "COMPETITOR & RESEARCH INSIGHTS", SECTION_RULE, ""]
 
     for idx, result in enumerate(results, 1):
         if result['success']:
-            lines.append(f"[Source {idx}: {result['title']}]")
-            lines.append(f"URL: {result['url']}")
-            lines.append("-" * 80)
-            lines.append(result['text'])
-            lines.append("")
+            lines.append(f"[Source {idx}: {result['title']}]\nURL: {result['url']}\n{ITEM_RULE}\n{result['text']}\n")
         else:
-            lines.append(f"[Source {idx}: Failed to fetch]")
-            lines.append(f"URL: {result['url']}")
-            lines.append(f"Error: {result['error']}")
-            lines.append("")
+            lines.append(f"[Source {idx}: Failed to fetch]\nURL: {result['url']}\nError: {result['error']}\n")
+
+    return "\n".join(lines), all(result['success'] for result in results)
 
-    return "\n".join(lines)
+
+def format_dashboard_insights(dashboard_insights):
+    """
+    Build the assistant message carrying every scraped dashboard summary.
+
+    Args:
+        dashboard_insights: Dictionary of dashboard URL -> text summary
+
+    Returns:
+        Markdown message content
+    """
+    # Joined in one pass; repeated += would copy the growing message per dashboard
+    return "".join([
+        "## Dashboard Insights Extracted by Manus AI\n\n",
+        *(f"### Dashboard: {url}\n\n{insights}\n\n---\n\n" for url, insights in dashboard_insights.items())
+    ])
 
 
 def format_dashboard_data_as_text(dashboard_data):
     """
-    Convert dashboard data into text summary - PRIORITIZES OCR DATA.
+    Convert dashboard data into text summary - PRIORITIZES OCR DATA,
+    plus the tables/metrics read from the page for views whose OCR was skipped.
 
     Args:
         dashboard_data: Dictionary with extracted dashboard data
@@ -842,17 +1344,13 @@ def format_dashboard_data_as_text(dashboard_data):
     Returns:
         String with formatted text summary
     """
-    lines = []
-
     # Add metadata
     metadata = dashboard_data.get('metadata', {})
-    lines.append("=" * 80)
-    lines.append("DASHBOARD DATA EXTRACTION")
-    lines.append("=" * 80)
+    lines = [SECTION_RULE, "DASHBOARD DATA EXTRACTION", SECTION_RULE]
     if metadata.get('dashboard_title'):
         lines.append(f"Dashboard: {metadata['dashboard_title']}")
+    # No extraction timestamp: it would make every report cache key unique
     lines.append(f"URL: {metadata.get('url', 'N/A')}")
-    lines.append(f"Extracted: {metadata.get('timestamp', 'N/A')}")
     lines.append("")
 
     # Add navigation info first to show scope
@@ -865,10 +1363,7 @@ def format_dashboard_data_as_text(dashboard_data):
     # PRIMARY DATA SOURCE: OCR extracted text - THIS IS THE MAIN DATA
     ocr_data = dashboard_data.get('ocr_text', [])
     if ocr_data:
-        lines.append("=" * 80)
-        lines.append("EXTRACTED DASHBOARD DATA (OCR from each tab)")
-        lines.append("=" * 80)
-        lines.append("")
+        lines.extend((SECTION_RULE, "EXTRACTED DASHBOARD DATA (OCR from each tab)", SECTION_RULE, ""))
 
         for idx, ocr_item in enumerate(ocr_data, 1):
             source = ocr_item.get('source', f'extraction_{idx}')
@@ -876,21 +1371,50 @@ def format_dashboard_data_as_text(dashboard_data):
             char_count = ocr_item.get('char_count', 0)
 
             if text:
-                lines.append(f"[Tab: {source}]")
-                lines.append(f"Characters extracted: {char_count}")
-                lines.append("-" * 80)
-                lines.append(text)
-                lines.append("")
-                lines.append("=" * 80)
+                # One multi-line block per tab instead of seven appends
+                lines.append(f"[Tab: {source}]\nCharacters extracted: {char_count}\n{ITEM_RULE}\n{text}\n\n{SECTION_RULE}\n")
+
+    # Views whose OCR was skipped because their data could be read straight from the page
+    ocr_skipped = dashboard_data.get('ocr_skipped', [])
+    if ocr_skipped and (dashboard_data.get('tables') or dashboard_data.get('metrics') or dashboard_data.get('charts')):
+        lines.extend((SECTION_RULE, "EXTRACTED DASHBOARD DATA (from page elements)", SECTION_RULE))
+        lines.append(f"Read from the page for: {', '.join(ocr_skipped)}")
+        lines.append("")
+
+        metrics = dashboard_data.get('metrics', [])
+        if metrics:
+            lines.append("[Metrics]")
+            lines.extend(
+                f"  {metric['metric_name']}: {metric['metric_value']}" if metric.get('metric_name')
+                else f"  {metric['metric_value']}"
+                for metric in metrics
+            )
+            lines.append("")
+
+        for table in dashboard_data.get('tables', []):
+            lines.append(f"[Table: {table['table_id']}]")
+            if table.get('headers'):
+                lines.append(" | ".join(table['headers']))
+                lines.append(ITEM_RULE)
+            lines.extend(" | ".join(row) for row in table['rows'])
+            lines.append("")
+
+        for chart in dashboard_data.get('charts', []):
+            if chart.get('labels'):
+                lines.append(f"[Chart: {chart.get('title', chart['chart_id'])}]")
+                lines.append(", ".join(chart['labels']))
                 lines.append("")
-    else:
+
+        lines.append(SECTION_RULE)
+        lines.append("")
+    elif not ocr_data:
         lines.append("⚠️ WARNING: No OCR data extracted. Dashboard may be restricted or empty.")
         lines.append("")
 
     # Add summary at the end
     summary = dashboard_data.get('summary', {})
     lines.append("EXTRACTION SUMMARY")
-    lines.append("-" * 80)
+    lines.append(ITEM_RULE)
     if summary.get('total_ocr_extractions'):
         lines.append(f"✓ OCR Extractions: {summary.get('total_ocr_extractions', 0)} tabs")
         lines.append(f"✓ Total Characters: {summary.get('total_ocr_characters', 0):,}")
@@ -905,9 +1429,79 @@ def format_dashboard_data_as_text(dashboard_data):
 # Helper Functions
 # ============================================================================
 
-def allowed_file(filename):
+def file_extension(filename):
+    """Return the lower-cased extension of a filename, or '' if it has none."""
+    _, dot, ext = filename.rpartition('.')
+    return ext.lower() if dot else ''
+
+
+def allowed_file(filename, allowed_extensions=ALLOWED_EXTENSIONS):
     """Check if file extension is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return file_extension(filename) in allowed_extensions
+
+
+# Uploaders resend the same names over and over; sanitize each one once
+safe_filename = lru_cache(maxsize=1024)(secure_filename)
+
+
+class HashingFileTarget(FileTarget):
+    """FileTarget that also computes the SHA-256 of the data as it is written"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def on_data_received(self, chunk):
+        self.digest.update(chunk)
+        super().on_data_received(chunk)
+
+
+def stream_analyze_form():
+    """
+    Parse the analyze form's multipart body incrementally.
+
+    The data file is written to a temp file chunk by chunk as it arrives, so
+    large uploads never sit in memory, and hashed on the way for the report
+    cache key. The temp file outlives the request (async jobs read it later);
+    generate_report deletes it.
+
+    Returns:
+        Tuple of (form fields dict, upload dict with 'filename', 'path' and
+        'sha256' or None)
+    """
+    parser = StreamingFormDataParser(headers=request.headers)
+
+    fields = {name: ValueTarget() for name in ANALYZE_FORM_FIELDS}
+    for name, target in fields.items():
+        parser.register(name, target)
+
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        upload_path = tmp.name
+    file_target = HashingFileTarget(upload_path)
+    parser.register("data_file", file_target)
+
+    try:
+        while True:
+            chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.data_received(chunk)
+    except Exception:
+        os.unlink(upload_path)
+        raise
+
+    data = {
+        name: target.value.decode("utf-8")
+        for name, target in fields.items()
+        if target.value
+    }
+
+    filename = safe_filename(file_target.multipart_filename or "")
+    if not filename:
+        os.unlink(upload_path)
+        return data, None
+
+    return data, {"filename": filename, "path": upload_path, "sha256": file_target.digest.hexdigest()}
 
 
 def validate_briefing(briefing):
@@ -922,8 +1516,15 @@ def validate_briefing(briefing):
     return errors
 
 
+@lru_cache(maxsize=1)
 def ensure_assistant():
-    """Create or retrieve the OpenAI Assistant."""
+    """
+    Create or retrieve the OpenAI Assistant.
+
+    Memoized: the OpenAI lookup runs once per process instead of on every
+    analyze request. Failures are not cached. Call ensure_assistant.cache_clear()
+    (or POST /api/admin/reload) to validate it again.
+    """
     global ASSISTANT_ID
 
     try:
@@ -957,38 +1558,52 @@ def ensure_assistant():
         raise Exception(f"Failed to create/retrieve assistant: {str(e)}")
 
 
-def poll_run_status(thread_id, run_id, timeout=300, poll_interval=1.5):
+def stream_run(thread_id, assistant_id, additional_instructions=None, timeout=300):
     """
-    Poll the run status until completion or timeout.
+    Run the assistant on a thread and wait for it via the streaming API.
+
+    Events arrive as the run progresses, so completion is seen immediately
+    (no status polling) and the final message comes with the stream instead
+    of a separate messages.list call.
 
     Args:
         thread_id: Thread ID
-        run_id: Run ID
+        assistant_id: Assistant to run
+        additional_instructions: Extra instructions for this run
         timeout: Maximum time to wait in seconds (default 5 minutes)
-        poll_interval: Time between status checks in seconds
 
     Returns:
-        Final run object
+        Tuple of (final run, text of the last assistant message or None)
     """
     start_time = time.time()
+    response_text = None
+
+    with client.beta.threads.runs.stream(
+        thread_id=thread_id,
+        assistant_id=assistant_id,
+        additional_instructions=additional_instructions
+    ) as stream:
+        for stream_event in stream:
+            if stream_event.event == "thread.run.created":
+                print(f"Started run: {stream_event.data.id}")
+            elif stream_event.event == "thread.message.completed" and stream_event.data.role == "assistant":
+                # Extract text content
+                response_text = "\n".join(
+                    block.text.value for block in stream_event.data.content if block.type == "text"
+                ).strip()
+            elif stream_event.event in ("thread.run.failed", "thread.run.cancelled", "thread.run.expired"):
+                run = stream_event.data
+                error_msg = f"Run ended with status: {run.status}"
+                if run.last_error:
+                    error_msg += f" - {run.last_error}"
+                raise Exception(error_msg)
 
-    while True:
-        elapsed = time.time() - start_time
-        if elapsed > timeout:
-            raise TimeoutError(f"Analysis timed out after {timeout} seconds")
-
-        run = client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
+            if time.time() - start_time > timeout:
+                raise TimeoutError(f"Analysis timed out after {timeout} seconds")
 
-        if run.status == "completed":
-            return run
-        elif run.status in ("failed", "cancelled", "expired"):
-            error_msg = f"Run ended with status: {run.status}"
-            if hasattr(run, 'last_error') and run.last_error:
-                error_msg += f" - {run.last_error}"
-            raise Exception(error_msg)
+        run = stream.get_final_run()
 
-        # Continue polling
-        time.sleep(poll_interval)
+    return run, response_text
 
 
 # ============================================================================
@@ -1000,6 +1615,7 @@ def poll_run_status(thread_id, run_id, timeout=300, poll_interval=1.5):
 # ============================================================================
 
 @app.route("/api/auth/signup", methods=["POST"])
+@limiter.limit(AUTH_RATE_LIMIT)
 def signup():
     """User registration endpoint"""
     try:
@@ -1015,15 +1631,9 @@ def signup():
         if len(password) < 8:
             return jsonify({"error": "Password must be at least 8 characters"}), 400
 
-        # Check if email already exists
-        if User.query.filter_by(email=email).first():
-            return jsonify({"error": "Email already registered"}), 400
-
-        # Check if username already exists (if provided)
-        if username and User.query.filter_by(username=username).first():
-            return jsonify({"error": "Username already taken"}), 400
-
-        # Create new user (requires admin approval)
+        # Create new user (requires admin approval). The UNIQUE constraints on
+        # email and username reject duplicates atomically, so the happy path is
+        # a single INSERT and concurrent signups can't both get through
         user = User(
             email=email,
             username=username or email.split('@')[0],
@@ -1032,7 +1642,14 @@ def signup():
         user.set_password(password)
 
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            # Rare path: look up which value was taken
+            if db.session.query(User.id).filter_by(email=email).first():
+                return jsonify({"error": "Email already registered"}), 400
+            return jsonify({"error": "Username already taken"}), 400
 
         # Send notification email to admin
         try:
@@ -1040,39 +1657,21 @@ def signup():
             app_url = os.getenv('APP_URL', 'http://localhost:5173')
             from_email = os.getenv('MAIL_DEFAULT_SENDER', 'noreply@supachat.global')
 
-            html_content = f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #7c3aed;">New User Registration Pending Approval</h2>
-                <p>A new user has registered and is awaiting approval:</p>
-                <div style="background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <p><strong>Email:</strong> {email}</p>
-                    <p><strong>Username:</strong> {username or email.split('@')[0]}</p>
-                    <p><strong>Registration Date:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}</p>
-                </div>
-                <p>
-                    <a href="{app_url}"
-                       style="background-color: #7c3aed; color: white; padding: 12px 24px;
-                              text-decoration: none; border-radius: 4px; display: inline-block;">
-                        Go to Admin Panel
-                    </a>
-                </p>
-                <p style="color: #666; font-size: 14px; margin-top: 20px;">
-                    Log in to your admin account to approve or reject this user.
-                </p>
-            </div>
-            """
+            html_content = render_template(
+                "emails/new_user.html",
+                email=email,
+                username=username or email.split('@')[0],
+                registered_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC'),
+                app_url=app_url
+            )
 
-            success, result = send_email_helper(
+            queue_email(
                 from_email=from_email,
                 to_emails=[admin_email],
                 subject=f"New User Registration: {email}",
-                html_content=html_content
+                html_content=html_content,
+                description="Admin notification"
             )
-
-            if success:
-                print(f"✓ Admin notification sent for new user: {email}")
-            else:
-                print(f"Warning: Could not send admin notification: {result}")
         except Exception as e:
             print(f"Warning: Could not send admin notification: {e}")
             # Continue anyway - user is created
@@ -1096,7 +1695,7 @@ def signup():
 def verify_email(token):
     """Email verification endpoint"""
     try:
-        user = User.query.filter_by(verification_token=token).first()
+        user = User.query.filter_by(verification_token_hash=hash_token(token)).first()
 
         if not user:
             return """
@@ -1121,7 +1720,7 @@ def verify_email(token):
 
         # Mark user as verified
         user.verified = True
-        user.verification_token = None  # Clear token after use
+        user.verification_token_hash = None  # Clear token after use
         db.session.commit()
 
         return """
@@ -1150,6 +1749,7 @@ def verify_email(token):
 
 
 @app.route("/api/auth/login", methods=["POST"])
+@limiter.limit(AUTH_RATE_LIMIT)
 def login():
     """User login endpoint with one-session-per-user enforcement"""
     try:
@@ -1178,7 +1778,7 @@ def login():
         existing_session = user.get_active_session()
         if existing_session:
             print(f"Deactivating existing session for user {user.email}")
-            existing_session.deactivate()
+            existing_session.deactivate(commit=False)
 
         # Create new session
         session_token = Session.generate_token()
@@ -1193,16 +1793,16 @@ def login():
 
         # Update last login
         user.last_login = datetime.utcnow()
+
+        # Create user stats if doesn't exist
+        ensure_user_stats(user.id)
+
+        # Session swap, last login and stats are written in one transaction
         db.session.commit()
 
         # Log in user with Flask-Login
         login_user(user, remember=True)
-
-        # Create user stats if doesn't exist
-        if not user.stats:
-            stats = UserStats(user_id=user.id)
-            db.session.add(stats)
-            db.session.commit()
+        session_activity_writer.touch(user.id)
 
         return jsonify({
             "success": True,
@@ -1227,6 +1827,10 @@ def login():
 def logout():
     """User logout endpoint"""
     try:
+        # Stop tracking first: a flush already in progress finishes before the
+        # session is deactivated, so it can't mark it active again
+        session_activity_writer.forget(current_user.id)
+
         # Deactivate current session
         active_session = current_user.get_active_session()
         if active_session:
@@ -1246,6 +1850,7 @@ def logout():
 
 
 @app.route("/api/auth/request-reset", methods=["POST"])
+@limiter.limit(AUTH_RATE_LIMIT)
 def request_password_reset():
     """Request password reset - sends reset email"""
     try:
@@ -1255,8 +1860,14 @@ def request_password_reset():
         if not email:
             return jsonify({"error": "Email is required"}), 400
 
+        # One reset email per address per interval; repeats get the same
+        # response without touching the database or the mail provider
+        with password_reset_cache_lock:
+            recently_sent = email in password_reset_cache
+            password_reset_cache[email] = True
+
         # Find user by email
-        user = User.query.filter_by(email=email).first()
+        user = None if recently_sent else User.query.filter_by(email=email).first()
 
         # Always return success to prevent email enumeration
         # Don't reveal whether email exists in database
@@ -1272,38 +1883,15 @@ def request_password_reset():
             try:
                 from_email = os.getenv('MAIL_DEFAULT_SENDER', 'noreply@supachat.global')
 
-                html_content = f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #4CAF50;">Password Reset Request</h2>
-                    <p>You requested to reset your password. Click the button below to set a new password:</p>
-                    <p style="margin: 30px 0;">
-                        <a href="{reset_url}"
-                           style="background-color: #4CAF50; color: white; padding: 12px 24px;
-                                  text-decoration: none; border-radius: 4px; display: inline-block;">
-                            Reset Password
-                        </a>
-                    </p>
-                    <p style="color: #666;">This link will expire in 24 hours.</p>
-                    <p style="color: #666;">If you didn't request this, please ignore this email.</p>
-                    <hr style="margin: 30px 0; border: none; border-top: 1px solid #ddd;">
-                    <p style="color: #999; font-size: 12px;">
-                        If the button doesn't work, copy and paste this link:<br>
-                        <a href="{reset_url}">{reset_url}</a>
-                    </p>
-                </div>
-                """
-
-                success, result = send_email_helper(
+                html_content = render_template("emails/password_reset.html", reset_url=reset_url)
+
+                queue_email(
                     from_email=from_email,
                     to_emails=[email],
                     subject="Reset Your Password - Supa Reports",
-                    html_content=html_content
+                    html_content=html_content,
+                    description="Password reset email"
                 )
-
-                if success:
-                    print(f"Password reset email sent to {email}")
-                else:
-                    print(f"Warning: Could not send password reset email: {result}")
             except Exception as e:
                 print(f"Error sending reset email: {e}")
                 # Continue anyway - don't reveal if email failed
@@ -1334,7 +1922,7 @@ def reset_password():
             return jsonify({"error": "Password must be at least 8 characters"}), 400
 
         # Find user with this reset token
-        user = User.query.filter_by(reset_token=token).first()
+        user = User.query.filter_by(reset_token_hash=hash_token(token)).first()
 
         if not user:
             return jsonify({"error": "Invalid or expired reset token"}), 400
@@ -1366,42 +1954,71 @@ def reset_password():
 @login_required
 def get_online_users():
     """Get all currently online users"""
+    with online_users_cache_lock:
+        payload = online_users_cache.get('online_users')
+    if payload is not None:
+        return app.response_class(payload, mimetype='application/json')
+
     try:
         # Query all active sessions with their users
         # Active sessions are those within the last 15 minutes
         active_threshold = datetime.utcnow() - timedelta(minutes=15)
 
-        active_sessions = Session.query.filter(
-            Session.is_active == True,
-            Session.last_active >= active_threshold
-        ).all()
+        # The session activity writer already holds everyone's latest activity
+        # in memory, so only the user columns need to come from the database
+        recent_activity = session_activity_writer.active_since(active_threshold)
+        if recent_activity is not None:
+            users = db.session.query(
+                User.id,
+                User.username,
+                User.email,
+                User.profile_picture
+            ).filter(User.id.in_(list(recent_activity))).all() if recent_activity else []
+            active_users = sorted(
+                (SimpleNamespace(**row._asdict(), last_active=recent_activity[row.id]) for row in users),
+                key=lambda row: row.last_active,
+                reverse=True
+            )
+        else:
+            # Not tracking for the whole window yet (fresh start): use the sessions table
+            # Latest activity per user, computed in the database
+            latest_activity = db.session.query(
+                Session.user_id,
+                db.func.max(Session.last_active).label('last_active')
+            ).filter(
+                Session.is_active == True,
+                Session.last_active >= active_threshold
+            ).group_by(Session.user_id).subquery()
+
+            # One joined query for just the columns we need, most recent activity first
+            active_users = db.session.query(
+                User.id,
+                User.username,
+                User.email,
+                User.profile_picture,
+                latest_activity.c.last_active
+            ).join(latest_activity, latest_activity.c.user_id == User.id).order_by(
+                latest_activity.c.last_active.desc()
+            ).all()
 
         # Build list of online users with their info
-        online_users = []
-        seen_user_ids = set()
-
-        for session in active_sessions:
-            if session.user_id not in seen_user_ids:
-                user = session.user
-                if user:
-                    online_users.append({
-                        'id': user.id,
-                        'username': user.username,
-                        'email': user.email,
-                        'profile_picture': user.profile_picture,
-                        'initials': user.username[0:2].upper() if user.username else user.email[0:2].upper(),
-                        'last_active': session.last_active.isoformat()
-                    })
-                    seen_user_ids.add(session.user_id)
-
-        # Sort by last active (most recent first)
-        online_users.sort(key=lambda x: x['last_active'], reverse=True)
-
-        return jsonify({
+        online_users = [{
+            'id': row.id,
+            'username': row.username,
+            'email': row.email,
+            'profile_picture': row.profile_picture,
+            'initials': row.username[0:2].upper() if row.username else row.email[0:2].upper(),
+            'last_active': row.last_active.isoformat()
+        } for row in active_users]
+
+        response = jsonify({
             'success': True,
             'count': len(online_users),
             'users': online_users
-        }), 200
+        })
+        with online_users_cache_lock:
+            online_users_cache['online_users'] = response.get_data()
+        return response, 200
 
     except Exception as e:
         print(f"Error fetching online users: {e}")
@@ -1409,47 +2026,67 @@ def get_online_users():
         return jsonify({"error": "Failed to fetch online users"}), 500
 
 
+def build_session_info(user):
+    """Build the user and stats sections of the session info response"""
+    # The user's stats and (for admins) the all-user report total in one round trip
+    columns = [UserStats]
+    if user.is_admin:
+        total_reports = db.session.query(
+            db.func.sum(UserStats.reports_count)
+        ).scalar_subquery()
+        columns.append(total_reports.label('total_reports'))
+
+    row = db.session.query(*columns).select_from(User).outerjoin(
+        UserStats, UserStats.user_id == User.id
+    ).filter(User.id == user.id).one()
+
+    user_stats = row.UserStats or UserStats(user_id=user.id)
+
+    # For admins, show total reports across all users
+    # For regular users, show only their own reports
+    if user.is_admin:
+        reports_count = row.total_reports or 0
+    else:
+        reports_count = user_stats.reports_count or 0
+
+    return {
+        "user": {
+            "id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "profile_picture": user.profile_picture,
+            "verified": user.verified,
+            "is_admin": user.is_admin,
+            "last_login": user.last_login.isoformat() if user.last_login else None
+        },
+        "stats": {
+            "reports": reports_count,
+            "audio": user_stats.audio_count,
+            "videos": user_stats.video_count,
+            "emails": user_stats.emails_sent_count,
+            "analyses": user_stats.analyses_count
+        }
+    }
+
+
 @app.route("/api/auth/session", methods=["GET"])
 @login_required
 def get_session_info():
     """Get current user session information"""
     try:
-        user_stats = current_user.stats or UserStats(user_id=current_user.id)
-
-        # Get total live sessions count
-        total_sessions = Session.query.filter_by(is_active=True).count()
-
-        # For admins, show total reports across all users
-        # For regular users, show only their own reports
-        if current_user.is_admin:
-            # Sum up all reports from all users
-            total_reports = db.session.query(
-                db.func.sum(UserStats.reports_count)
-            ).scalar() or 0
-            reports_count = total_reports
-        else:
-            # Show only this user's reports
-            reports_count = user_stats.reports_count
+        cache = admin_session_info_cache if current_user.is_admin else session_info_cache
+        with session_info_cache_lock:
+            payload = cache.get(current_user.id)
+
+        if payload is None:
+            payload = build_session_info(current_user)
+            with session_info_cache_lock:
+                cache[current_user.id] = payload
 
         return jsonify({
-            "user": {
-                "id": current_user.id,
-                "email": current_user.email,
-                "username": current_user.username,
-                "profile_picture": current_user.profile_picture,
-                "verified": current_user.verified,
-                "is_admin": current_user.is_admin,
-                "last_login": current_user.last_login.isoformat() if current_user.last_login else None
-            },
-            "stats": {
-                "reports": reports_count,
-                "audio": user_stats.audio_count,
-                "videos": user_stats.video_count,
-                "emails": user_stats.emails_sent_count,
-                "analyses": user_stats.analyses_count
-            },
+            **payload,
             "global_stats": {
-                "live_sessions": total_sessions
+                "live_sessions": get_live_session_count()
             }
         }), 200
 
@@ -1513,39 +2150,20 @@ def approve_user():
             app_url = os.getenv('APP_URL', 'http://localhost:5173')
             from_email = os.getenv('MAIL_DEFAULT_SENDER', 'noreply@supachat.global')
 
-            html_content = f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #4CAF50;">✓ Your Account Has Been Approved!</h2>
-                <p>Good news! Your account has been approved by our admin team.</p>
-                <div style="background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <p><strong>Email:</strong> {user.email}</p>
-                    <p><strong>Username:</strong> {user.username}</p>
-                </div>
-                <p>You can now log in and start using Supa Reports:</p>
-                <p>
-                    <a href="{app_url}"
-                       style="background-color: #4CAF50; color: white; padding: 12px 24px;
-                              text-decoration: none; border-radius: 4px; display: inline-block;">
-                        Log In Now
-                    </a>
-                </p>
-                <p style="color: #666; font-size: 14px; margin-top: 20px;">
-                    Welcome to Supa Reports!
-                </p>
-            </div>
-            """
+            html_content = render_template(
+                "emails/account_approved.html",
+                email=user.email,
+                username=user.username,
+                app_url=app_url
+            )
 
-            success, result = send_email_helper(
+            queue_email(
                 from_email=from_email,
                 to_emails=[user.email],
                 subject="Account Approved - Supa Reports",
-                html_content=html_content
+                html_content=html_content,
+                description="Approval email"
             )
-
-            if success:
-                print(f"✓ Approval email sent to: {user.email}")
-            else:
-                print(f"Warning: Could not send approval email: {result}")
         except Exception as e:
             print(f"Warning: Could not send approval email: {e}")
             # Continue anyway - user is approved
@@ -1593,28 +2211,15 @@ def reject_user():
             try:
                 from_email = os.getenv('MAIL_DEFAULT_SENDER', 'noreply@supachat.global')
 
-                html_content = f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #f44336;">Account Registration Update</h2>
-                    <p>Thank you for your interest in Supa Reports.</p>
-                    <p>Unfortunately, we are unable to approve your account registration at this time.</p>
-                    <p style="color: #666; font-size: 14px; margin-top: 20px;">
-                        If you believe this is an error, please contact our support team.
-                    </p>
-                </div>
-                """
-
-                success, result = send_email_helper(
+                html_content = render_template("emails/account_rejected.html")
+
+                queue_email(
                     from_email=from_email,
                     to_emails=[user_email],
                     subject="Account Registration - Supa Reports",
-                    html_content=html_content
+                    html_content=html_content,
+                    description="Rejection email"
                 )
-
-                if success:
-                    print(f"✓ Rejection email sent to: {user_email}")
-                else:
-                    print(f"Warning: Could not send rejection email: {result}")
             except Exception as e:
                 print(f"Warning: Could not send rejection email: {e}")
 
@@ -1660,10 +2265,41 @@ def get_all_users():
         return jsonify({"error": "Failed to fetch users"}), 500
 
 
+@app.route("/api/admin/reload", methods=["POST"])
+@admin_required
+def admin_reload():
+    """Drop the memoized assistant so the next analyze request looks it up again"""
+    ensure_assistant.cache_clear()
+    return jsonify({"success": True, "message": "Assistant cache cleared"}), 200
+
+
 # ============================================================================
 # User Profile Routes
 # ============================================================================
 
+def save_profile_thumbnail(stream, filepath):
+    """Downscale an uploaded image to PROFILE_PICTURE_SIZE and save it as JPEG"""
+    from PIL import Image, ImageOps
+
+    with Image.open(stream) as img:
+        # Let the JPEG decoder skip detail we'd throw away anyway (no-op for other formats)
+        img.draft('RGB', (PROFILE_PICTURE_SIZE * 2, PROFILE_PICTURE_SIZE * 2))
+        img.seek(0)  # First frame of animated GIFs
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((PROFILE_PICTURE_SIZE, PROFILE_PICTURE_SIZE), Image.LANCZOS)
+
+        # JPEG has no alpha channel: flatten transparent pictures onto white
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel('A'))
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        img.save(filepath, format='JPEG', quality=85, optimize=True, progressive=True)
+
+
 @app.route("/api/user/profile-picture", methods=["POST"])
 @login_required
 def upload_profile_picture():
@@ -1677,16 +2313,25 @@ def upload_profile_picture():
                 return jsonify({"error": "No file selected"}), 400
 
             # Validate file type
-            allowed_extensions = {'png', 'jpg', 'jpeg', 'gif'}
-            ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+            ext = file_extension(file.filename)
 
-            if ext not in allowed_extensions:
+            if ext not in PROFILE_PICTURE_EXTENSIONS:
                 return jsonify({"error": "Invalid file type. Only PNG, JPG, JPEG, GIF allowed"}), 400
 
-            # Save file
-            filename = f"user_{current_user.id}.{ext}"
-            filepath = os.path.join(UPLOADS_DIR, filename)
-            file.save(filepath)
+            # Store a small JPEG thumbnail instead of the original upload
+            filename = f"user_{current_user.id}.jpg"
+            from PIL import Image
+            try:
+                save_profile_thumbnail(file.stream, os.path.join(UPLOADS_DIR, filename))
+            except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+                # DecompressionBombError: dimensions far beyond Pillow's pixel limit
+                return jsonify({"error": "Invalid image file"}), 400
+
+            # Remove pictures saved under other extensions by earlier uploads
+            for old_ext in PROFILE_PICTURE_EXTENSIONS - {'jpg'}:
+                old_path = os.path.join(UPLOADS_DIR, f"user_{current_user.id}.{old_ext}")
+                if os.path.exists(old_path):
+                    os.remove(old_path)
 
             # Update user profile picture path
             current_user.profile_picture = f"/static/uploads/profiles/{filename}"
@@ -1732,9 +2377,16 @@ def index():
 
 @app.route("/assets/<path:filename>")
 def serve_assets(filename):
-    """Serve files from the assets directory."""
-    assets_dir = os.path.join(os.path.dirname(__file__), 'assets')
-    return send_from_directory(assets_dir, filename)
+    """Serve files from the assets directory (handed to nginx when ASSETS_ACCEL_PREFIX is set)."""
+    if ASSETS_ACCEL_PREFIX:
+        path = safe_join(ASSETS_DIR, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        return Response(
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            headers={'X-Accel-Redirect': ASSETS_ACCEL_PREFIX.rstrip('/') + '/' + filename}
+        )
+    return send_from_directory(ASSETS_DIR, filename)
 
 
 @app.route("/api/health", methods=["GET"])
@@ -1754,9 +2406,12 @@ def send_email():
     Send HTML email to recipients.
     Accepts JSON with: from_email, to_emails (list), subject, html_content
     Uses Resend API (preferred) or SMTP (fallback for local dev)
+    With async=true the send is queued and a job ID is returned to poll
+    at /api/send-email/status/<job_id>.
     """
     try:
         data = request.get_json()
+        run_async = str(data.get('async', False)).lower() == 'true'
 
         from_email = data.get('from_email')
         to_emails = data.get('to_emails', [])
@@ -1783,21 +2438,21 @@ def send_email():
                 "message": "Please configure RESEND_API_KEY or SMTP credentials"
             }), 400
 
-        # Send email using helper function
-        success, result = send_email_helper(from_email, to_emails, subject, html_content)
-
-        if success:
+        if run_async:
+            job_id = email_jobs.submit(
+                send_email_job, from_email, to_emails, subject, html_content,
+                attempts=EMAIL_JOB_ATTEMPTS
+            )
+            logger.info("Queued email job: %s", job_id)
             return jsonify({
                 "success": True,
-                "message": f"Email sent to {len(to_emails)} recipient(s)",
-                "recipients": to_emails
-            }), 200
-        else:
-            return jsonify({
-                "error": "Failed to send email",
-                "message": result,
-                "details": result
-            }), 500
+                "job_id": job_id,
+                "status_url": url_for("send_email_status", job_id=job_id)
+            }), 202
+
+        # Send email using helper function
+        result = send_email_job(from_email, to_emails, subject, html_content)
+        return jsonify(result["body"]), result["status_code"]
 
     except Exception as e:
         error_msg = f"Error sending email: {str(e)}"
@@ -1810,11 +2465,104 @@ def send_email():
         }), 500
 
 
+@app.route("/api/send-email/status/<job_id>", methods=["GET"])
+def send_email_status(job_id):
+    """Report the state of a queued email send, including its result once finished."""
+    job = email_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found or expired"}), 404
+
+    response = {
+        "job_id": job_id,
+        "state": job['state']
+    }
+    if job['state'] == 'finished':
+        response["status_code"] = job['result']['status_code']
+        response["result"] = job['result']['body']
+    elif job['state'] == 'failed':
+        response["error"] = job['error']
+
+    return jsonify(response), 200
+
+
+def upload_video_to_cloudinary(video, convert_to_gif=True, gif_duration=5):
+    """
+    Upload a video to Cloudinary, optionally with an email-sized GIF of its start.
+
+    Args:
+        video: File path or readable file object (e.g. the request's upload stream)
+        convert_to_gif: Whether to derive a GIF from the first seconds
+        gif_duration: Length of the GIF in seconds
+
+    Returns:
+        JSON body for /api/upload-to-cloudinary
+    """
+    # Use Cloudinary's transformation to create GIF
+    # Extract first N seconds, optimize for email
+    gif_transformation = [
+        {'duration': gif_duration},         # First N seconds
+        {'width': 600, 'crop': 'scale'},    # Resize to 600px width
+        {'quality': 'auto:low'},            # Optimize file size
+        {'flags': 'animated'},              # Ensure it's animated
+        {'effect': 'loop'}                  # Infinite looping
+    ]
+
+    # Upload original video to Cloudinary in chunks; the GIF is derived
+    # eagerly in the background so its URL is ready on first view
+    print("Uploading original video...")
+    upload_jobs.update_progress(stage='uploading')
+    video_upload = cloudinary.uploader.upload_large(
+        video,
+        resource_type="video",
+        folder="supa_reports/videos",
+        overwrite=True,
+        chunk_size=CLOUDINARY_CHUNK_SIZE,
+        eager=[{'transformation': gif_transformation, 'format': 'gif'}] if convert_to_gif else None,
+        eager_async=True
+    )
+
+    video_url = video_upload['secure_url']
+    print(f"✓ Video uploaded: {video_url}")
+
+    gif_url = None
+    if convert_to_gif:
+        print(f"Converting first {gif_duration} seconds to GIF...")
+
+        gif_public_id = video_upload['public_id']
+
+        # Build GIF URL with the same transformations as the eager derivation
+        gif_url, _ = cloudinary.utils.cloudinary_url(
+            gif_public_id,
+            resource_type='video',
+            format='gif',
+            transformation=gif_transformation
+        )
+
+        print(f"✓ GIF URL generated: {gif_url}")
+
+    return {
+        "success": True,
+        "video_url": video_url,
+        "gif_url": gif_url,
+        "public_id": video_upload['public_id'],
+        "duration": video_upload.get('duration', 0)
+    }
+
+
+def run_cloudinary_upload_job(video, convert_to_gif, gif_duration):
+    """Upload a spooled copy of the video on the upload workers, then release it."""
+    try:
+        return upload_video_to_cloudinary(video, convert_to_gif, gif_duration)
+    finally:
+        video.close()
+
+
 @app.route("/api/upload-to-cloudinary", methods=["POST"])
 def upload_to_cloudinary():
     """
     Upload video to Cloudinary and optionally convert to GIF.
-    Accepts video file and returns public URLs for both video and GIF.
+    Accepts video file and returns public URLs for both video and GIF,
+    or with async=true a job ID to poll at /api/upload-to-cloudinary/status/<job_id>.
     """
     try:
         if not CLOUDINARY_CLOUD_NAME:
@@ -1835,64 +2583,27 @@ def upload_to_cloudinary():
         # Get optional parameters
         convert_to_gif = request.form.get('convert_to_gif', 'true').lower() == 'true'
         gif_duration = int(request.form.get('gif_duration', '5'))  # Default 5 seconds
+        run_async = request.form.get('async', 'false').lower() == 'true'
 
         print(f"📤 Uploading video to Cloudinary: {video_file.filename}")
 
-        # Save video temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as temp_video:
-            video_file.save(temp_video.name)
-            temp_video_path = temp_video.name
-
-        try:
-            # Upload original video to Cloudinary
-            print("Uploading original video...")
-            video_upload = cloudinary.uploader.upload(
-                temp_video_path,
-                resource_type="video",
-                folder="supa_reports/videos",
-                overwrite=True,
-                notification_url=None
+        if run_async:
+            # The request stream is gone once we return, so keep a copy for the worker
+            # (in memory unless it is larger than UPLOAD_SPOOL_SIZE)
+            video_copy = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+            video_file.save(video_copy)
+            video_copy.seek(0)
+            job_id = upload_jobs.submit(
+                run_cloudinary_upload_job, video_copy, convert_to_gif, gif_duration
             )
-
-            video_url = video_upload['secure_url']
-            print(f"✓ Video uploaded: {video_url}")
-
-            gif_url = None
-            if convert_to_gif:
-                print(f"Converting first {gif_duration} seconds to GIF...")
-
-                # Use Cloudinary's transformation to create GIF
-                # Extract first N seconds, optimize for email
-                gif_public_id = video_upload['public_id']
-
-                # Build GIF URL with transformations
-                gif_url, _ = cloudinary.utils.cloudinary_url(
-                    gif_public_id,
-                    resource_type='video',
-                    format='gif',
-                    transformation=[
-                        {'duration': gif_duration},         # First N seconds
-                        {'width': 600, 'crop': 'scale'},    # Resize to 600px width
-                        {'quality': 'auto:low'},            # Optimize file size
-                        {'flags': 'animated'},              # Ensure it's animated
-                        {'effect': 'loop'}                  # Infinite looping
-                    ]
-                )
-
-                print(f"✓ GIF URL generated: {gif_url}")
-
+            logger.info("Queued Cloudinary upload job: %s", job_id)
             return jsonify({
                 "success": True,
-                "video_url": video_url,
-                "gif_url": gif_url,
-                "public_id": video_upload['public_id'],
-                "duration": video_upload.get('duration', 0)
-            })
+                "job_id": job_id,
+                "status_url": url_for("upload_to_cloudinary_status", job_id=job_id)
+            }), 202
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_video_path):
-                os.unlink(temp_video_path)
+        return jsonify(upload_video_to_cloudinary(video_file.stream, convert_to_gif, gif_duration))
 
     except Exception as e:
         print(f"Error uploading to Cloudinary: {str(e)}")
@@ -1903,18 +2614,40 @@ def upload_to_cloudinary():
         }), 500
 
 
-@app.route("/api/analyze", methods=["POST"])
-def analyze():
+@app.route("/api/upload-to-cloudinary/status/<job_id>", methods=["GET"])
+def upload_to_cloudinary_status(job_id):
+    """Report the state of a queued Cloudinary upload, including its result once finished."""
+    job = upload_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found or expired"}), 404
+
+    response = {
+        "job_id": job_id,
+        "state": job['state'],
+        "progress": job['progress']
+    }
+    if job['state'] == 'finished':
+        response["result"] = job['result']
+    elif job['state'] == 'failed':
+        response["error"] = job['error']
+
+    return jsonify(response), 200
+
+
+def generate_report(data, upload=None, user_id=None):
     """
-    Main analysis endpoint.
-    Accepts briefing form data and optional file upload.
-    Returns structured analysis JSON.
+    Run the full report generation pipeline for a submitted briefing.
+
+    Args:
+        data: Briefing form fields (dict of strings)
+        upload: Optional dict with 'filename', 'path' (and 'sha256') of the saved data file
+        user_id: ID of the requesting user, if authenticated
+
+    Returns:
+        Tuple of (response body dict, HTTP status code)
     """
     start_time = time.time()
     try:
-        # Parse briefing fields from form data
-        data = request.form.to_dict()
-
         # Parse comma-separated fields
         competitors_list = [x.strip() for x in data.get("competitors", "").split(",") if x.strip()]
         competitor_urls_list = [x.strip() for x in data.get("competitor_urls", "").split(",") if x.strip()]
@@ -1951,242 +2684,306 @@ def analyze():
         # Validate briefing
         validation_errors = validate_briefing(briefing)
         if validation_errors:
-            return jsonify({"error": "Validation failed", "details": validation_errors}), 400
-
-        # Ensure assistant exists
-        assistant_id = ensure_assistant()
-
-        # Create thread
-        thread = client.beta.threads.create()
-        print(f"Created thread: {thread.id}")
-
-        # Initial message
-        client.beta.threads.messages.create(
-            thread_id=thread.id,
-            role="user",
-            content="Start new analysis. I will provide briefing and potentially a data file."
-        )
-
-        # Handle file upload if provided
-        file_ids = []
-        if "data_file" in request.files:
-            file = request.files["data_file"]
+            return {"error": "Validation failed", "details": validation_errors}, 400
 
-            if file and file.filename:
-                # Validate file
-                if not allowed_file(file.filename):
-                    return jsonify({
-                        "error": f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
-                    }), 400
-
-                # Secure the filename
-                filename = secure_filename(file.filename)
-
-                # Save to temp file and upload to OpenAI
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{filename}") as tmp:
-                    file.save(tmp.name)
-
-                    try:
-                        with open(tmp.name, "rb") as f:
-                            uploaded_file = client.files.create(file=f, purpose="assistants")
-                            file_ids.append(uploaded_file.id)
-                            print(f"Uploaded file: {uploaded_file.id}")
-                    finally:
-                        # Clean up temp file
-                        os.unlink(tmp.name)
-
-                # Attach file to thread
-                client.beta.threads.messages.create(
-                    thread_id=thread.id,
-                    role="user",
-                    content=f"Here is the latest data export: {filename}",
-                    attachments=[
-                        {"file_id": fid, "tools": [{"type": "file_search"}, {"type": "code_interpreter"}]}
-                        for fid in file_ids
-                    ]
-                )
+        # Start the slow data gathering in the background so it overlaps with
+        # hashing the upload and building the briefing below
+        report_jobs.update_progress(stage='gathering', pct=10)
 
         # Analyze dashboards with Playwright if provided
-        dashboard_insights = {}
+        dashboard_future = None
         if briefing['dashboard_links']:
             print(f"📊 Found {len(briefing['dashboard_links'])} dashboard link(s), scraping with Playwright...")
-            dashboard_insights = analyze_dashboards_with_playwright(briefing['dashboard_links'])
+            dashboard_future = report_io_pool.submit(analyze_dashboards_with_playwright, briefing['dashboard_links'])
 
         # Fetch competitor and research insights
-        competitor_insights = ""
-        all_research_urls = competitor_urls_list + research_urls
+        competitor_future = None
+        # The same page pasted in both fields (or twice) is only fetched once
+        all_research_urls = dedupe_urls(competitor_urls_list + research_urls)
         if all_research_urls:
             print(f"🔍 Found {len(all_research_urls)} competitor/research URLs to analyze...")
-            competitor_insights = fetch_competitor_insights(all_research_urls)
+            competitor_future = report_io_pool.submit(fetch_competitor_insights, all_research_urls)
+
+        file_hash = (upload.get('sha256') or hash_file(upload['path'])) if upload else None
 
-        # Send briefing
-        briefing_content = f"""Here is the completed briefing form:
+        # Briefing
+        briefing_message = f"""Here is the completed briefing form:
 
 Brand: {briefing['brand']}
 Market: {briefing['market']}
 Reporting Period: {briefing['reporting_period']}
 Objective: {briefing['objective']}
-Competitors: {json.dumps(briefing['competitors'], indent=2)}
+Competitors: {orjson.dumps(briefing['competitors']).decode('utf-8')}
 Dashboard Links: {', '.join(briefing['dashboard_links']) if briefing['dashboard_links'] else 'None'}
 Research URLs: {', '.join(briefing['research_urls']) if briefing['research_urls'] else 'None'}
 Hypotheses: {', '.join(briefing['hypotheses']) if briefing['hypotheses'] else 'None'}
 """
-        client.beta.threads.messages.create(
-            thread_id=thread.id,
-            role="user",
-            content=briefing_content
+
+        # Wait for the background dashboard scrape and competitor fetch
+        report_jobs.update_progress(stage='scraping', pct=20)
+        dashboard_insights, dashboards_ok = dashboard_future.result() if dashboard_future else ({}, True)
+        competitor_insights, competitors_ok = competitor_future.result() if competitor_future else ("", True)
+        # A report built from failed scrapes (login redirect, timeout, unreachable
+        # URL) is still returned, but not cached, so the next request retries them
+        cacheable = dashboards_ok and competitors_ok
+
+        # Return the stored response if this exact request was generated recently
+        # from the same dashboard and competitor content
+        cache_key = report_cache_key(
+            briefing,
+            competitor_urls_list,
+            file_hash,
+            scraped={'dashboards': dashboard_insights, 'competitors': competitor_insights}
         )
+        cached = get_cached_report(cache_key) if cacheable else None
+        if cached:
+            logger.info("✓ Report cache hit: %s", cache_key[:12])
+            duration = time.time() - start_time
+            log_usage('report_generation', {
+                'status': 'cached',
+                'brand': data.get('brand', 'Unknown'),
+                'market': data.get('market', 'Unknown'),
+                'objective': data.get('objective', 'Unknown'),
+                'duration_seconds': round(duration, 2),
+                'has_file_upload': upload is not None,
+                'thread_id': cached.get('thread_id'),
+                'run_id': cached.get('run_id')
+            })
+            if user_id:
+                log_activity(
+                    user_id=user_id,
+                    action_type='report_generated',
+                    details={
+                        'brand': data.get('brand', 'Unknown'),
+                        'market': data.get('market', 'Unknown'),
+                        'duration_seconds': round(duration, 2),
+                        'cached': True
+                    },
+                    resource_id=cached.get('thread_id')
+                )
+            return {**cached, "cached": True}, 200
+
+        # Ensure assistant exists
+        assistant_id = ensure_assistant()
+
+        # Create thread
+        thread = client.beta.threads.create()
+        print(f"Created thread: {thread.id}")
+
+        # Everything for the assistant goes out as one message (one round-trip)
+        message_parts = ["Start new analysis. I will provide briefing and potentially a data file."]
+        attachments = []
+
+        # Upload the data file if provided
+        if upload:
+            report_jobs.update_progress(stage='uploading', pct=30)
+            filename = upload['filename']
+            # Sent under the original name so OpenAI can tell the file type
+            with open(upload['path'], "rb") as f:
+                uploaded_file = client.files.create(file=(filename, f), purpose="assistants")
+                print(f"Uploaded file: {uploaded_file.id}")
+
+            # Attach file to the message
+            message_parts.append(f"Here is the latest data export: {filename}")
+            attachments.append({
+                "file_id": uploaded_file.id,
+                "tools": [{"type": "file_search"}, {"type": "code_interpreter"}]
+            })
+
+        message_parts.append(briefing_message)
 
-        # Send dashboard insights if extracted
+        # Dashboard insights if extracted
         if dashboard_insights:
-            dashboard_content = "## Dashboard Insights Extracted by Manus AI\n\n"
-            for url, insights in dashboard_insights.items():
-                dashboard_content += f"### Dashboard: {url}\n\n{insights}\n\n---\n\n"
-
-            client.beta.threads.messages.create(
-                thread_id=thread.id,
-                role="user",
-                content=dashboard_content
-            )
-            print(f"✓ Sent dashboard insights to assistant ({len(dashboard_insights)} dashboard(s))")
+            message_parts.append(format_dashboard_insights(dashboard_insights))
+            print(f"✓ Adding dashboard insights for assistant ({len(dashboard_insights)} dashboard(s))")
 
-        # Send competitor and research insights if fetched
+        # Competitor and research insights if fetched
         if competitor_insights:
-            client.beta.threads.messages.create(
-                thread_id=thread.id,
-                role="user",
-                content=competitor_insights
-            )
-            print(f"✓ Sent competitor/research insights to assistant ({len(all_research_urls)} URLs)")
+            message_parts.append(competitor_insights)
+            print(f"✓ Adding competitor/research insights for assistant ({len(all_research_urls)} URLs)")
 
         # Request analysis
+        message_parts.append("Run full analysis using the core brief framework. Return output_schema JSON only.")
+
         client.beta.threads.messages.create(
             thread_id=thread.id,
             role="user",
-            content="Run full analysis using the core brief framework. Return output_schema JSON only."
+            content="\n\n---\n\n".join(message_parts),
+            attachments=attachments
         )
 
-        # Create and run the assistant
-        run = client.beta.threads.runs.create(
-            thread_id=thread.id,
-            assistant_id=assistant_id,
-            instructions=(
-                "CRITICAL: Analyze data from three sources: "
-                "1) Uploaded files using file_search + code_interpreter, "
-                "2) Scraped dashboard data provided in the briefing (tables, metrics, KPIs), "
-                "3) Competitor and research insights extracted from provided URLs. "
-                "Dashboard data is automatically extracted via browser automation and included in your context. "
-                "Competitor/research insights are fetched and analyzed from the URLs provided in the briefing. "
-                "If none of these data sources are available, state this clearly and do NOT fabricate metrics. "
-                "NEVER make up numbers for impressions, clicks, CTR, conversions, or any performance data. "
-                "Use the competitor insights to provide context, benchmarking, and competitive analysis. "
-                "Respond strictly in output_schema JSON format with actual data from available sources."
-            )
-        )
-
-        print(f"Started run: {run.id}")
-
-        # Poll for completion
-        final_run = poll_run_status(thread.id, run.id)
-        print(f"Run completed: {final_run.id}")
+        # The scraped text can be large; don't hold it while the assistant runs
+        dashboard_insights = dashboard_future = competitor_insights = message_parts = briefing_message = None
 
-        # Retrieve messages
-        messages = client.beta.threads.messages.list(thread_id=thread.id)
+        # Run the assistant, streaming its events until the run finishes
+        report_jobs.update_progress(stage='analyzing', pct=50)
+        run, raw_response = stream_run(thread.id, assistant_id, REPORT_RUN_INSTRUCTIONS)
+        print(f"Run completed: {run.id}")
 
-        # Find the assistant's response
-        for msg in messages.data:
-            if msg.role == "assistant":
-                # Extract text content
-                parts = []
-                for content_block in msg.content:
-                    if content_block.type == "text":
-                        parts.append(content_block.text.value)
-
-                raw_response = "\n".join(parts).strip()
+        if raw_response is None:
+            return {"error": "No assistant message found in thread"}, 500
 
-                # Try to parse as JSON
-                try:
-                    parsed_json = json.loads(raw_response)
+        # Try to parse as JSON
+        try:
+            parsed_json = orjson.loads(raw_response)
+
+            # Log successful generation
+            duration = time.time() - start_time
+            log_usage('report_generation', {
+                'status': 'success',
+                'brand': data.get('brand', 'Unknown'),
+                'market': data.get('market', 'Unknown'),
+                'objective': data.get('objective', 'Unknown'),
+                'duration_seconds': round(duration, 2),
+                'duration_formatted': f"{int(duration // 60)}:{int(duration % 60):02d}",
+                'has_file_upload': upload is not None,
+                'thread_id': thread.id,
+                'run_id': run.id
+            })
 
-                    # Log successful generation
-                    duration = time.time() - start_time
-                    log_usage('report_generation', {
-                        'status': 'success',
+            # Increment user's report counter if authenticated
+            if user_id:
+                log_activity(
+                    user_id=user_id,
+                    action_type='report_generated',
+                    details={
                         'brand': data.get('brand', 'Unknown'),
                         'market': data.get('market', 'Unknown'),
-                        'objective': data.get('objective', 'Unknown'),
-                        'duration_seconds': round(duration, 2),
-                        'duration_formatted': f"{int(duration // 60)}:{int(duration % 60):02d}",
-                        'has_file_upload': 'data_file' in request.files,
-                        'thread_id': thread.id,
-                        'run_id': run.id
-                    })
-
-                    # Increment user's report counter if authenticated
-                    if current_user.is_authenticated:
-                        log_activity(
-                            user_id=current_user.id,
-                            action_type='report_generated',
-                            details={
-                                'brand': data.get('brand', 'Unknown'),
-                                'market': data.get('market', 'Unknown'),
-                                'duration_seconds': round(duration, 2)
-                            },
-                            resource_id=thread.id
-                        )
-
-                    return jsonify({
-                        "success": True,
-                        "data": parsed_json,
-                        "thread_id": thread.id,
-                        "run_id": run.id
-                    })
-                except json.JSONDecodeError:
-                    # Return raw response if not valid JSON
-                    return jsonify({
-                        "success": False,
-                        "error": "Response was not valid JSON",
-                        "raw_response": raw_response,
-                        "thread_id": thread.id
-                    }), 500
+                        'duration_seconds': round(duration, 2)
+                    },
+                    resource_id=thread.id
+                )
 
-        return jsonify({"error": "No assistant message found in thread"}), 500
+            body = {
+                "success": True,
+                "data": parsed_json,
+                "thread_id": thread.id,
+                "run_id": run.id
+            }
+            if cacheable:
+                store_cached_report(cache_key, body)
+            else:
+                logger.info("Report not cached: some dashboards or URLs could not be scraped")
+            return body, 200
+        except json.JSONDecodeError:
+            # Return raw response if not valid JSON
+            return {
+                "success": False,
+                "error": "Response was not valid JSON",
+                "raw_response": raw_response,
+                "thread_id": thread.id
+            }, 500
 
     except TimeoutError as e:
         # Log failed generation
         duration = time.time() - start_time
         log_usage('report_generation', {
             'status': 'timeout',
-            'brand': data.get('brand', 'Unknown') if 'data' in locals() else 'Unknown',
+            'brand': data.get('brand', 'Unknown'),
             'duration_seconds': round(duration, 2),
             'error': str(e)
         })
-        return jsonify({"error": str(e)}), 408
+        return {"error": str(e)}, 408
     except Exception as e:
         # Log failed generation
         duration = time.time() - start_time
         log_usage('report_generation', {
             'status': 'error',
-            'brand': data.get('brand', 'Unknown') if 'data' in locals() else 'Unknown',
+            'brand': data.get('brand', 'Unknown'),
             'duration_seconds': round(duration, 2),
             'error': str(e),
             'error_type': type(e).__name__
         })
 
-        print(f"Error in /api/analyze: {str(e)}")
+        print(f"Error generating report: {str(e)}")
         if DEBUG:
             traceback.print_exc()
-        return jsonify({
+        return {
             "error": "Internal server error",
             "message": str(e),
             "type": type(e).__name__
-        }), 500
+        }, 500
+    finally:
+        # Clean up the saved upload once it has been sent to OpenAI (or failed to)
+        if upload and os.path.exists(upload['path']):
+            os.unlink(upload['path'])
+
+
+def run_report_job(data, upload, user_id):
+    """Generate a report on a report worker thread (needs its own app context)."""
+    with app.app_context():
+        body, status_code = generate_report(data, upload, user_id)
+    return {"status_code": status_code, "body": body}
+
+
+@app.route("/api/analyze", methods=["POST"])
+def analyze():
+    """
+    Main analysis endpoint.
+    Accepts briefing form data and optional file upload.
+    Returns structured analysis JSON, or with async=true a job ID
+    to poll at /api/analyze/status/<job_id>.
+    """
+    if request.mimetype == "multipart/form-data":
+        # Stream the body straight to disk instead of buffering it through request.files
+        data, upload = stream_analyze_form()
+    else:
+        data, upload = request.form.to_dict(), None
+    run_async = data.pop("async", "false").lower() == "true"
+
+    if upload and not allowed_file(upload["filename"]):
+        os.unlink(upload["path"])
+        return jsonify({
+            "error": f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+        }), 400
+
+    user_id = current_user.id if current_user.is_authenticated else None
+
+    if run_async:
+        job_id = report_jobs.submit(run_report_job, data, upload, user_id)
+        logger.info("Queued report job: %s", job_id)
+        return jsonify({
+            "success": True,
+            "job_id": job_id,
+            "status_url": url_for("analyze_status", job_id=job_id)
+        }), 202
+
+    body, status_code = generate_report(data, upload, user_id)
+    return jsonify(body), status_code
+
+
+@app.route("/api/analyze/status/<job_id>", methods=["GET"])
+def analyze_status(job_id):
+    """Report the state of a queued report job, including its result once finished."""
+    job = report_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found or expired"}), 404
+
+    response = {
+        "job_id": job_id,
+        "state": job['state'],
+        "progress": job['progress']
+    }
+    if job['state'] == 'finished':
+        response["status_code"] = job['result']['status_code']
+        response["result"] = job['result']['body']
+    elif job['state'] == 'failed':
+        response["error"] = job['error']
+
+    return jsonify(response), 200
+
+
+# Serialized voice list; the ElevenLabs catalog changes over hours, not seconds
+VOICES_CACHE_TTL = 3600
+voices_cache = TTLCache(maxsize=1, ttl=VOICES_CACHE_TTL)
+voices_cache_lock = threading.Lock()
 
 
 @app.route("/api/elevenlabs-voices", methods=["GET"])
 def get_elevenlabs_voices():
     """
     Fetch available voices from ElevenLabs API.
+    Successful responses are cached for VOICES_CACHE_TTL seconds.
     """
     try:
         if not ELEVENLABS_API_KEY:
@@ -2195,13 +2992,15 @@ def get_elevenlabs_voices():
                 "message": "Please add ELEVENLABS_API_KEY to your .env file"
             }), 500
 
+        with voices_cache_lock:
+            payload = voices_cache.get('voices')
+        if payload is not None:
+            return app.response_class(payload, mimetype='application/json')
+
         # Call ElevenLabs API to get voices
         url = "https://api.elevenlabs.io/v1/voices"
-        headers = {
-            "xi-api-key": ELEVENLABS_API_KEY
-        }
 
-        response = requests.get(url, headers=headers)
+        response = elevenlabs_session.get(url)
 
         if response.status_code != 200:
             return jsonify({
@@ -2223,7 +3022,11 @@ def get_elevenlabs_voices():
                 "preview_url": voice.get("preview_url", "")
             })
 
-        return jsonify({"voices": formatted_voices})
+        # Only successful lists are cached, so API errors are retried next time
+        response = jsonify({"voices": formatted_voices})
+        with voices_cache_lock:
+            voices_cache['voices'] = response.get_data()
+        return response
 
     except Exception as e:
         print(f"Error fetching ElevenLabs voices: {str(e)}")
@@ -2234,103 +3037,132 @@ def get_elevenlabs_voices():
         }), 500
 
 
-# Quote of the Day caching
-quote_cache = {
+# Quote of the Day caching: today's quote (keyed by date), plus the last quote
+# fetched as the fallback when BrainyQuote can't be reached or parsed
+QUOTE_CACHE_TTL = 86400
+quote_cache = TTLCache(maxsize=1, ttl=QUOTE_CACHE_TTL)
+quote_cache_lock = threading.Lock()
+last_quote = {
     'quote': 'The only way to do great work is to love what you do.',
-    'author': 'Steve Jobs',
-    'date': None
+    'author': 'Steve Jobs'
+}
+BRAINYQUOTE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
 }
 
 
-@app.route("/api/quote-of-the-day", methods=["GET"])
-def get_quote_of_the_day():
+def fetch_quote_of_the_day():
     """
-    Fetch the quote of the day from BrainyQuote.
-    Caches the quote for 24 hours.
+    Fetch and parse the quote of the day from BrainyQuote.
+
+    Returns:
+        Dict with quote and author, or None if the page couldn't be fetched or parsed
     """
-    try:
-        from datetime import date
+    from lxml import html as lxml_html
 
-        today = str(date.today())
+    url = "https://www.brainyquote.com/quote_of_the_day"
 
-        # Return cached quote if it's from today
-        if quote_cache['date'] == today and quote_cache['quote']:
-            return jsonify({
-                'quote': quote_cache['quote'],
-                'author': quote_cache['author'],
-                'source': 'BrainyQuote',
-                'cached': True
-            })
+    response = http_session.get(url, headers=BRAINYQUOTE_HEADERS, timeout=10)
 
-        # Fetch fresh quote
-        url = "https://www.brainyquote.com/quote_of_the_day"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
+    if response.status_code != 200:
+        return None
 
-        response = requests.get(url, headers=headers, timeout=10)
+    # lxml's C parser, as in fetch_url_content; only two nodes are needed
+    doc = lxml_html.document_fromstring(response.content)
 
-        if response.status_code != 200:
-            # Return cached quote (fallback)
-            return jsonify({
-                'quote': quote_cache['quote'],
-                'author': quote_cache['author'],
-                'source': 'BrainyQuote',
-                'cached': True
-            })
+    # Find the first quote of the day
+    quote_elem = first_match(doc, class_xpath('qotd-q-cntr', 'b-qt'))
+    author_elem = first_match(doc, class_xpath('qotd-q-cntr', 'bq-aut'))
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+    if quote_elem is None:
+        # Try alternative selectors
+        quote_elem = first_match(doc, class_xpath('oncl_q'))
+        author_elem = first_match(doc, class_xpath('oncl_a'))
 
-        # Find the first quote of the day
-        quote_elem = soup.select_one('.qotd-q-cntr .b-qt')
-        author_elem = soup.select_one('.qotd-q-cntr .bq-aut')
+    if quote_elem is None:
+        return None
 
-        if not quote_elem:
-            # Try alternative selectors
-            quote_elem = soup.select_one('.oncl_q')
-            author_elem = soup.select_one('.oncl_a')
+    return {
+        'quote': element_text(quote_elem),
+        'author': element_text(author_elem) if author_elem is not None else "Unknown"
+    }
 
-        if quote_elem:
-            quote_text = quote_elem.get_text(strip=True)
-            author_text = author_elem.get_text(strip=True) if author_elem else "Unknown"
 
-            # Update cache
-            quote_cache['quote'] = quote_text
-            quote_cache['author'] = author_text
-            quote_cache['date'] = today
+@lru_cache(maxsize=None)
+def class_xpath(*classes):
+    """
+    Compiled XPath equivalent of the CSS descendant selector '.a .b ...'
 
-            return jsonify({
-                'quote': quote_text,
-                'author': author_text,
-                'source': 'BrainyQuote',
-                'cached': False
-            })
-        else:
-            # Return cached quote (fallback)
-            return jsonify({
-                'quote': quote_cache['quote'],
-                'author': quote_cache['author'],
-                'source': 'BrainyQuote',
-                'cached': True
-            })
+    Each selector is compiled once per process and reused by later fetches.
+    """
+    from lxml import etree
 
-    except Exception as e:
-        print(f"Error fetching quote: {str(e)}")
-        traceback.print_exc()
+    return etree.XPath(''.join(
+        f'//*[contains(concat(" ", normalize-space(@class), " "), " {cls} ")]'
+        for cls in classes
+    ))
+
+
+def first_match(doc, xpath):
+    """First element matching the compiled xpath in doc, or None"""
+    matches = xpath(doc)
+    return matches[0] if matches else None
+
+
+def element_text(elem):
+    """An element's text with whitespace collapsed"""
+    return ' '.join(elem.text_content().split())
 
-        # Return cached quote (fallback)
-        return jsonify({
-            'quote': quote_cache['quote'],
-            'author': quote_cache['author'],
-            'source': 'BrainyQuote',
-            'cached': True
-        })
+
+@app.route("/api/quote-of-the-day", methods=["GET"])
+def get_quote_of_the_day():
+    """
+    Fetch the quote of the day from BrainyQuote.
+    Caches the quote for the day; responses carry an ETag and are
+    cacheable by browsers until midnight.
+    """
+    from datetime import date
+
+    today = date.today()
+    cached = True
+
+    with quote_cache_lock:
+        quote = quote_cache.get(today)
+
+    if quote is None:
+        try:
+            quote = fetch_quote_of_the_day()
+        except Exception as e:
+            print(f"Error fetching quote: {str(e)}")
+            traceback.print_exc()
+            quote = None
+
+        if quote:
+            cached = False
+            with quote_cache_lock:
+                quote_cache[today] = quote
+                last_quote.update(quote)
+
+    if quote is None:
+        # Return cached quote (fallback); not cacheable so the next request retries
+        response = jsonify({**last_quote, 'source': 'BrainyQuote', 'cached': True})
+        response.cache_control.no_cache = True
+        return response
+
+    response = jsonify({**quote, 'source': 'BrainyQuote', 'cached': cached})
+
+    # Same quote means same content, whether or not it came from the cache
+    response.set_etag(hashlib.md5(f"{today}{quote['quote']}{quote['author']}".encode()).hexdigest(), weak=True)
+    response.cache_control.public = True
+    tomorrow = datetime.combine(today + timedelta(days=1), datetime.min.time())
+    response.cache_control.max_age = max(int((tomorrow - datetime.now()).total_seconds()), 0)
+    return response.make_conditional(request)
 
 
 @app.route("/api/generate-audio", methods=["POST"])
@@ -2356,13 +3188,8 @@ def generate_audio():
         if not voice_id:
             return jsonify({"error": "No voice_id provided"}), 400
 
-        # Call ElevenLabs API
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": ELEVENLABS_API_KEY
-        }
+        # Call ElevenLabs API (streaming variant: audio starts before synthesis finishes)
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
         payload = {
             "text": text,
             "model_id": "eleven_monolingual_v1",
@@ -2372,17 +3199,28 @@ def generate_audio():
             }
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = elevenlabs_session.post(url, json=payload, headers=TTS_HEADERS, stream=True, timeout=(5, 120))
 
         if response.status_code != 200:
+            message = response.text
+            response.close()
             return jsonify({
                 "error": "ElevenLabs API error",
-                "message": response.text,
+                "message": message,
                 "status_code": response.status_code
             }), response.status_code
 
-        # Return audio as binary response
-        return Response(response.content, mimetype="audio/mpeg")
+        # Relay the audio chunks as they arrive instead of buffering the whole MP3
+        def generate():
+            try:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        yield chunk
+            finally:
+                # Hand the connection back to the shared pool even if the client disconnects
+                response.close()
+
+        return Response(generate(), mimetype="audio/mpeg")
 
     except Exception as e:
         print(f"Error in generate_audio: {str(e)}")
@@ -2393,20 +3231,20 @@ def generate_audio():
         }), 500
 
 
-def upload_file_to_topview(file_path, file_type='image'):
+def upload_file_to_topview(file, filename, file_type='image'):
     """
     Upload a file to TopView AI using 3-step process:
     1. Get upload credentials
     2. Upload to S3
     3. Check upload status
-    """
-    headers = {
-        "Topview-Uid": TOPVIEW_UID,
-        "Authorization": f"Bearer {TOPVIEW_API_KEY}"
-    }
 
+    Args:
+        file: Readable file object, positioned at the start of the data
+        filename: Original filename, used to pick the upload format
+        file_type: 'image' or 'audio'
+    """
     # Determine file format
-    file_ext = os.path.splitext(file_path)[1].lower().lstrip('.')
+    file_ext = os.path.splitext(filename or '')[1].lower().lstrip('.')
     if file_type == 'image':
         # Supported: jpg, png, jpeg, bmp, webp
         format_map = {'jpg': 'jpg', 'jpeg': 'jpg', 'png': 'png', 'bmp': 'bmp', 'webp': 'webp'}
@@ -2416,13 +3254,12 @@ def upload_file_to_topview(file_path, file_type='image'):
         format_map = {'mp3': 'mp3', 'wav': 'wav', 'm4a': 'm4a'}
         file_format = format_map.get(file_ext, 'mp3')
 
-    print(f"Uploading {file_type} file: {file_path} (format: {file_format})")
+    print(f"Uploading {file_type} file: {filename} (format: {file_format})")
 
     # Step 1: Get upload credentials
     print("Step 1: Getting upload credentials...")
-    cred_response = requests.get(
+    cred_response = topview_session.get(
         f"https://api.topview.ai/v1/upload/credential?format={file_format}",
-        headers=headers,
         timeout=30
     )
 
@@ -2445,12 +3282,10 @@ def upload_file_to_topview(file_path, file_type='image'):
 
     # Step 2: Upload file to S3
     print("Step 2: Uploading file to S3...")
-    with open(file_path, 'rb') as f:
-        file_data = f.read()
-
-    upload_response = requests.put(
+    # Pass the file object so requests streams it instead of copying it into a bytes body
+    upload_response = upload_session.put(
         upload_url,
-        data=file_data,
+        data=file,
         headers={'Content-Type': 'application/octet-stream'},
         timeout=120
     )
@@ -2462,9 +3297,8 @@ def upload_file_to_topview(file_path, file_type='image'):
 
     # Step 3: Check upload status
     print("Step 3: Checking upload status...")
-    check_response = requests.get(
+    check_response = topview_session.get(
         f"https://api.topview.ai/v1/upload/check?fileId={file_id}",
-        headers=headers,
         timeout=30
     )
 
@@ -2482,6 +3316,157 @@ def upload_file_to_topview(file_path, file_type='image'):
     return file_id
 
 
+def get_audio_duration(audio_data):
+    """
+    Length in seconds of an audio file given as bytes.
+
+    mutagen reads it from the MP3/M4A/WAV headers in-process; ffprobe is
+    only started for containers mutagen doesn't recognise.
+    """
+    import mutagen
+
+    try:
+        audio = mutagen.File(BytesIO(audio_data))
+        if audio is not None and audio.info.length:
+            return audio.info.length
+    except mutagen.MutagenError as e:
+        print(f"mutagen could not read the audio ({e}), using ffprobe")
+
+    duration_result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', 'pipe:0'],
+        input=audio_data,
+        capture_output=True,
+        timeout=10
+    )
+    return float(duration_result.stdout.decode().strip())
+
+
+def probe_media_streams(path):
+    """
+    Codec details of a media file's first video and audio streams.
+
+    Returns:
+        Dict with video_codec, pix_fmt and audio_codec (None where absent or unknown)
+    """
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'stream=codec_type,codec_name,pix_fmt',
+         '-of', 'json', path],
+        capture_output=True,
+        timeout=30
+    )
+    info = {'video_codec': None, 'pix_fmt': None, 'audio_codec': None}
+    if result.returncode != 0:
+        return info
+
+    for stream in orjson.loads(result.stdout).get('streams', []):
+        if stream.get('codec_type') == 'video' and info['video_codec'] is None:
+            info['video_codec'] = stream.get('codec_name')
+            info['pix_fmt'] = stream.get('pix_fmt')
+        elif stream.get('codec_type') == 'audio' and info['audio_codec'] is None:
+            info['audio_codec'] = stream.get('codec_name')
+    return info
+
+
+# FFmpeg arguments per hardware encoder: (before -i, video encoding)
+HW_ENCODER_ARGS = {
+    'h264_nvenc': (
+        ['-hwaccel', 'cuda'],
+        ['-c:v', 'h264_nvenc', '-preset', 'p4', '-rc', 'vbr', '-cq', '23', '-pix_fmt', 'yuv420p']
+    ),
+    'h264_vaapi': (
+        ['-vaapi_device', VAAPI_DEVICE],
+        ['-vf', 'format=nv12,hwupload', '-c:v', 'h264_vaapi', '-qp', '23']
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def detect_hw_encoder():
+    """
+    Name of a working hardware H.264 encoder, or None to use libx264.
+
+    Probed once per process: ffmpeg must list the encoder *and* be able to
+    encode a few test frames with it, since builds ship encoders for GPUs
+    the host may not have.
+    """
+    candidates = {
+        'auto': ['h264_nvenc', 'h264_vaapi'],
+        'nvenc': ['h264_nvenc'],
+        'vaapi': ['h264_vaapi'],
+    }.get(FFMPEG_HW_ENCODER, [])
+    if not candidates:
+        return None
+
+    try:
+        listed = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        ).stdout
+        for encoder in candidates:
+            if encoder not in listed:
+                continue
+            input_args, video_args = HW_ENCODER_ARGS[encoder]
+            test = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-v', 'error',
+                 *input_args,
+                 '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.2',
+                 *video_args, '-f', 'null', '-'],
+                capture_output=True,
+                timeout=30
+            )
+            if test.returncode == 0:
+                print(f"✓ Using hardware encoder for lipsync videos: {encoder}")
+                return encoder
+    except Exception as e:
+        print(f"Warning: Could not probe hardware encoders: {e}")
+    return None
+
+
+def build_lipsync_ffmpeg_command(input_path, output_path):
+    """
+    FFmpeg command making a lipsync video browser-compatible (H.264 yuv420p + AAC, faststart).
+
+    Streams that are already compatible are copied as is (TopView usually
+    delivers H.264/AAC, so the common case is a remux at disk speed); only
+    the others are encoded, on the GPU when detect_hw_encoder() finds one.
+    """
+    streams = probe_media_streams(input_path)
+    print(f"Source streams: {streams}")
+
+    input_args = []
+    if streams['video_codec'] == 'h264' and streams['pix_fmt'] == 'yuv420p':
+        video_args = ['-c:v', 'copy']
+    elif detect_hw_encoder():
+        input_args, video_args = HW_ENCODER_ARGS[detect_hw_encoder()]
+    else:
+        video_args = [
+            '-c:v', 'libx264',              # H.264 video codec
+            '-preset', FFMPEG_X264_PRESET,  # Encoding speed
+            '-crf', '23',                   # Quality (lower = better, 23 is default)
+            '-pix_fmt', 'yuv420p'           # Pixel format for compatibility
+        ]
+
+    if streams['audio_codec'] in ('aac', None):
+        audio_args = ['-c:a', 'copy']
+    else:
+        audio_args = ['-c:a', 'aac', '-b:a', '128k']  # AAC audio codec and bitrate
+
+    return [
+        'ffmpeg',
+        *input_args,
+        '-i', input_path,
+        *video_args,
+        *audio_args,
+        '-movflags', '+faststart',  # Enable progressive playback
+        '-f', 'mp4',
+        '-y',  # Overwrite output file
+        output_path
+    ]
+
+
 @app.route("/api/generate-lipsync", methods=["POST"])
 def generate_lipsync():
     """
@@ -2508,24 +3493,21 @@ def generate_lipsync():
         audio_file = request.files['audio']
         prompt = request.form.get('prompt', '')
 
-        # Save files temporarily
-        image_temp = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-        audio_temp = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+        # Work from the uploads in memory instead of temp files: the image is
+        # streamed from the request as is, and the audio is read once because
+        # its duration is measured too (both are bounded by MAX_CONTENT_LENGTH)
+        audio_data = audio_file.read()
 
-        image_file.save(image_temp.name)
-        audio_file.save(audio_temp.name)
+        # Both TopView uploads (credential, S3 PUT, check) run side by side while
+        # the audio is measured here
+        print("Uploading image and audio to TopView AI...")
+        image_upload = topview_upload_pool.submit(upload_file_to_topview, image_file.stream, image_file.filename, 'image')
+        audio_upload = topview_upload_pool.submit(upload_file_to_topview, BytesIO(audio_data), audio_file.filename, 'audio')
 
         # Get audio duration to estimate processing time
         print("Calculating audio duration...")
         try:
-            duration_result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                 '-of', 'default=noprint_wrappers=1:nokey=1', audio_temp.name],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            audio_duration_seconds = float(duration_result.stdout.strip())
+            audio_duration_seconds = get_audio_duration(audio_data)
             print(f"Audio duration: {audio_duration_seconds:.2f} seconds")
 
             # TopView takes ~45 seconds to render 1 second of video
@@ -2539,25 +3521,13 @@ def generate_lipsync():
             estimated_processing_time = 3600  # Default to 60 minutes
             estimated_minutes = 60
 
-        print("Uploading image to TopView AI...")
-        image_file_id = upload_file_to_topview(image_temp.name, 'image')
+        image_file_id = image_upload.result()
         print(f"Image uploaded, file ID: {image_file_id}")
 
-        print("Uploading audio to TopView AI...")
-        audio_file_id = upload_file_to_topview(audio_temp.name, 'audio')
+        audio_file_id = audio_upload.result()
         print(f"Audio uploaded, file ID: {audio_file_id}")
 
-        # Clean up temp files
-        os.unlink(image_temp.name)
-        os.unlink(audio_temp.name)
-
         # Step 1: Submit task
-        headers = {
-            "Topview-Uid": TOPVIEW_UID,
-            "Authorization": f"Bearer {TOPVIEW_API_KEY}",
-            "Content-Type": "application/json"
-        }
-
         payload = {
             "templateImageFileId": image_file_id,
             "mode": "avatar4",
@@ -2569,9 +3539,8 @@ def generate_lipsync():
 
         print(f"Submitting task to TopView AI with payload: {payload}")
 
-        response = requests.post(
+        response = topview_session.post(
             "https://api.topview.ai/v1/photo_avatar/task/submit",
-            headers=headers,
             json=payload,
             timeout=30
         )
@@ -2600,19 +3569,23 @@ def generate_lipsync():
 
         # Step 2: Poll for completion
         print(f"Polling for task completion: {task_id}")
-        # Calculate max_attempts based on estimated processing time
-        # Poll every 5 seconds, add 10 minutes buffer to estimated time
-        max_attempts = int((estimated_processing_time + 600) / 5)  # +10 min buffer
-        print(f"Max polling attempts: {max_attempts} (will wait up to {max_attempts * 5 / 60:.1f} minutes)")
+        # Wait up to the estimated processing time plus a 10 minute buffer.
+        # Polls back off from TOPVIEW_POLL_INITIAL to TOPVIEW_POLL_MAX seconds, and
+        # drop back to the initial delay whenever the task status changes
+        max_wait = estimated_processing_time + 600
+        deadline = time.monotonic() + max_wait
+        print(f"Will wait up to {max_wait / 60:.1f} minutes")
         attempt = 0
+        delay = TOPVIEW_POLL_INITIAL
+        last_status = None
 
-        while attempt < max_attempts:
-            time.sleep(5)  # Wait 5 seconds between polls
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * TOPVIEW_POLL_BACKOFF, TOPVIEW_POLL_MAX)
             attempt += 1
 
-            query_response = requests.get(
+            query_response = topview_session.get(
                 f"https://api.topview.ai/v1/photo_avatar/task/query?taskId={task_id}&needCloudFrontUrl",
-                headers=headers,
                 timeout=30
             )
 
@@ -2628,6 +3601,9 @@ def generate_lipsync():
 
             result_data = query_result.get('result', {})
             status = result_data.get('status')
+            if status != last_status:
+                last_status = status
+                delay = TOPVIEW_POLL_INITIAL
 
             if status == 'success':
                 video_url = result_data.get('finishedVideoUrl')
@@ -2640,36 +3616,30 @@ def generate_lipsync():
 
                     # Download and re-encode video for better compatibility
                     print("Downloading video for re-encoding...")
+                    reencoded_path = None
                     try:
-                        video_response = requests.get(video_url, timeout=120)
-                        if video_response.status_code == 200:
-                            # Save original video temporarily
-                            original_video = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
-                            original_video.write(video_response.content)
-                            original_video.close()
-
+                        with http_session.get(video_url, stream=True, timeout=120) as video_response:
+                            downloaded = video_response.status_code == 200
+                            if downloaded:
+                                # Save original video temporarily, writing chunks as they
+                                # arrive instead of holding the whole MP4 in memory
+                                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as original_video:
+                                    for chunk in video_response.iter_content(chunk_size=1 << 16):
+                                        original_video.write(chunk)
+
+                        if downloaded:
                             print(f"Original video saved: {original_video.name}")
 
-                            # Re-encode with FFmpeg for maximum compatibility
-                            # H.264 codec with AAC audio is the most compatible format
-                            reencoded_video = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
-                            reencoded_path = reencoded_video.name
-                            reencoded_video.close()
+                            # Remux/re-encode with FFmpeg for maximum compatibility
+                            # H.264 codec with AAC audio is the most compatible format.
+                            # FFmpeg writes straight into the static folder, so there is no
+                            # placeholder temp file to create and move afterwards
+                            os.makedirs(VIDEOS_DIR, exist_ok=True)
+                            video_filename = f"lipsync_{int(time.time())}_{safe_filename(str(task_id))[-8:]}.mp4"
+                            reencoded_path = os.path.join(VIDEOS_DIR, video_filename)
 
                             print("Re-encoding video with FFmpeg...")
-                            ffmpeg_command = [
-                                'ffmpeg',
-                                '-i', original_video.name,
-                                '-c:v', 'libx264',  # H.264 video codec
-                                '-preset', 'fast',   # Encoding speed
-                                '-crf', '23',        # Quality (lower = better, 23 is default)
-                                '-c:a', 'aac',       # AAC audio codec
-                                '-b:a', '128k',      # Audio bitrate
-                                '-movflags', '+faststart',  # Enable progressive playback
-                                '-pix_fmt', 'yuv420p',  # Pixel format for compatibility
-                                '-y',  # Overwrite output file
-                                reencoded_path
-                            ]
+                            ffmpeg_command = build_lipsync_ffmpeg_command(original_video.name, reencoded_path)
 
                             print(f"FFmpeg command: {' '.join(ffmpeg_command)}")
                             result = subprocess.run(
@@ -2686,17 +3656,9 @@ def generate_lipsync():
                                 print(f"FFmpeg stderr: {result.stderr[-500:]}")  # Last 500 chars
 
                             if result.returncode == 0:
-                                print(f"✓ Video re-encoded successfully: {reencoded_path}")
-                                print(f"  Re-encoded file size: {os.path.getsize(reencoded_path)} bytes")
-
-                                # Save to static folder for serving
-                                static_dir = os.path.join(os.path.dirname(__file__), 'static', 'videos')
-                                os.makedirs(static_dir, exist_ok=True)
-
-                                video_filename = f"lipsync_{int(time.time())}.mp4"
-                                final_path = os.path.join(static_dir, video_filename)
-
-                                shutil.move(reencoded_path, final_path)
+                                final_path = reencoded_path
+                                print(f"✓ Video re-encoded successfully: {final_path}")
+                                print(f"  Re-encoded file size: {os.path.getsize(final_path)} bytes")
 
                                 # Clean up original temp file
                                 os.unlink(original_video.name)
@@ -2735,6 +3697,9 @@ def generate_lipsync():
                     except Exception as reencode_error:
                         print(f"Re-encoding failed: {str(reencode_error)}")
                         traceback.print_exc()
+                        # Don't leave a partial file in the served folder
+                        if reencoded_path and os.path.exists(reencoded_path):
+                            os.unlink(reencoded_path)
 
                     # Fall back to original URL if anything goes wrong
                     duration = time.time() - start_time
@@ -2817,9 +3782,10 @@ def proxy_video():
         print(f"Proxying video from: {video_url}")
 
         # Fetch the video from the external URL
-        response = requests.get(video_url, stream=True, timeout=30)
+        response = http_session.get(video_url, stream=True, timeout=30)
 
         if response.status_code != 200:
+            response.close()
             return jsonify({
                 "error": "Failed to fetch video",
                 "status": response.status_code
@@ -2830,9 +3796,13 @@ def proxy_video():
 
         # Stream the video content
         def generate():
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    yield chunk
+            try:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        yield chunk
+            finally:
+                # Hand the connection back to the shared pool even if the client disconnects
+                response.close()
 
         return Response(
             generate(),
@@ -2859,9 +3829,8 @@ def serve_video(filename):
     Serve video files with correct MIME type for browser compatibility.
     """
     try:
-        videos_dir = os.path.join(os.path.dirname(__file__), 'static', 'videos')
         return send_from_directory(
-            videos_dir,
+            VIDEOS_DIR,
             filename,
             mimetype='video/mp4',
             as_attachment=False,
@@ -2889,30 +3858,22 @@ def chat_modify():
         if not current_report:
             return jsonify({"error": "No report data provided"}), 400
 
-        # Build prompt for OpenAI
-        system_prompt = """You are an AI assistant helping to modify marketing analysis reports.
-You will receive a JSON report and a modification request from the user.
-Your task is to modify the report according to the request while maintaining the exact JSON structure.
-
-CRITICAL RULES:
-1. Maintain the EXACT same JSON structure
-2. Keep all section names: audience, media, creative, conversion, competitive, optimization, bonus, citations
-3. Each section (except bonus and citations) must have: key_findings, supporting_data, research_context, implications, actions
-4. Only modify content relevant to the user's request
-5. Return ONLY valid JSON, no explanations"""
-
-        user_prompt = f"""Current Report:
-{json.dumps(current_report, indent=2)}
+        # Report goes in its own message ahead of the request so repeated
+        # edits of the same report share a cached prompt prefix. Compact JSON:
+        # indentation only adds tokens
+        report_context = f"""Current Report:
+{orjson.dumps(current_report).decode('utf-8')}"""
 
-User's Modification Request: {message}
+        user_prompt = f"""User's Modification Request: {message}
 
 Please modify the report according to the user's request and return the complete modified report as valid JSON."""
 
         # Call OpenAI API with JSON mode
-        response = client.chat.completions.create(
+        response = chat_client.chat.completions.create(
             model=MODEL_ID,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": CHAT_MODIFY_SYSTEM_PROMPT},
+                {"role": "user", "content": report_context},
                 {"role": "user", "content": user_prompt}
             ],
             response_format={"type": "json_object"},
@@ -2925,7 +3886,7 @@ Please modify the report according to the user's request and return the complete
         print(f"OpenAI response length: {len(modified_report_text)}")
 
         try:
-            modified_report = json.loads(modified_report_text)
+            modified_report = orjson.loads(modified_report_text)
             print(f"Successfully parsed JSON with keys: {list(modified_report.keys())}")
 
             return jsonify({
@@ -2969,12 +3930,6 @@ def generate_script():
         if not report:
             return jsonify({"error": "No report data provided"}), 400
 
-        # Build prompt for OpenAI
-        system_prompt = """You are a creative scriptwriter specializing in marketing and brand content.
-Your task is to create engaging scripts from marketing analysis reports.
-The scripts should be clear, concise, and suitable for video, audio, or presentation formats.
-Focus on the most impactful insights and make them audience-friendly."""
-
         # Summarize the report for context
         report_summary = f"""Report Summary:
 Sections covered: {', '.join(report.keys())}
@@ -2993,17 +3948,16 @@ Key Insights:
             if 'one_sentence' in bonus:
                 report_summary += f"\n\nKey Takeaway: {bonus['one_sentence']}"
 
-        user_prompt = f"""{report_summary}
-
-User's Script Request: {prompt}
+        user_prompt = f"""User's Script Request: {prompt}
 
 Please create a script based on the user's request. Make it engaging, clear, and focused on the most important insights from the report."""
 
         # Call OpenAI API
-        response = client.chat.completions.create(
+        response = chat_client.chat.completions.create(
             model=MODEL_ID,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SCRIPT_SYSTEM_PROMPT},
+                {"role": "user", "content": report_summary},
                 {"role": "user", "content": user_prompt}
             ],
             temperature=0.8,
@@ -3029,6 +3983,27 @@ Please create a script based on the user's request. Make it engaging, clear, and
         }), 500
 
 
+# Report sections and per-section fields, in export order: (report key, title)
+EXPORT_SECTIONS = (
+    ("audience", "Audience & Targeting Insights"),
+    ("media", "Media & Channel Effectiveness"),
+    ("creative", "Creative Performance & Engagement"),
+    ("conversion", "Conversion & Performance Drivers"),
+    ("competitive", "Competitive & Market Insights"),
+    ("optimization", "Optimization & Next Steps")
+)
+EXPORT_FIELDS = (
+    ("key_findings", "Key Findings"),
+    ("supporting_data", "Supporting Data"),
+    ("research_context", "Research Context"),
+    ("implications", "Implications"),
+    ("actions", "Actions")
+)
+# Upper-case titles for the plain text export
+EXPORT_TXT_SECTIONS = tuple((key, title.upper()) for key, title in EXPORT_SECTIONS)
+EXPORT_TXT_FIELDS = tuple((key, title.upper()) for key, title in EXPORT_FIELDS)
+
+
 @app.route("/api/export-txt", methods=["POST"])
 def export_txt():
     """Export report as plain text file."""
@@ -3039,60 +4014,45 @@ def export_txt():
         if not report:
             return jsonify({"error": "No report data provided"}), 400
 
-        # Build text content
-        text_lines = []
-        text_lines.append("=" * 80)
-        text_lines.append("SUPA REPORTS - ANALYSIS REPORT")
-        text_lines.append("=" * 80)
-        text_lines.append(f"\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        # Encode the text straight into the response buffer as it is written,
+        # instead of collecting lines, joining them and encoding the result
+        buffer = BytesIO()
+        out = TextIOWrapper(buffer, encoding='utf-8', newline='\n')
+        print("=" * 80, file=out)
+        print("SUPA REPORTS - ANALYSIS REPORT", file=out)
+        print("=" * 80, file=out)
+        print(f"\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", file=out)
 
         # Process each section
-        sections = {
-            "audience": "AUDIENCE & TARGETING INSIGHTS",
-            "media": "MEDIA & CHANNEL EFFECTIVENESS",
-            "creative": "CREATIVE PERFORMANCE & ENGAGEMENT",
-            "conversion": "CONVERSION & PERFORMANCE DRIVERS",
-            "competitive": "COMPETITIVE & MARKET INSIGHTS",
-            "optimization": "OPTIMIZATION & NEXT STEPS"
-        }
-
-        for key, title in sections.items():
+        for key, title in EXPORT_TXT_SECTIONS:
             if key in report and report[key]:
                 section = report[key]
-                text_lines.append(f"\n{'=' * 80}")
-                text_lines.append(title)
-                text_lines.append('=' * 80)
-
-                for field_name, field_title in [
-                    ("key_findings", "KEY FINDINGS"),
-                    ("supporting_data", "SUPPORTING DATA"),
-                    ("research_context", "RESEARCH CONTEXT"),
-                    ("implications", "IMPLICATIONS"),
-                    ("actions", "ACTIONS")
-                ]:
+                print(f"\n{'=' * 80}", file=out)
+                print(title, file=out)
+                print('=' * 80, file=out)
+
+                for field_name, field_title in EXPORT_TXT_FIELDS:
                     if field_name in section and section[field_name]:
-                        text_lines.append(f"\n{field_title}:")
+                        print(f"\n{field_title}:", file=out)
                         for item in section[field_name]:
-                            text_lines.append(f"  • {item}")
+                            print(f"  • {item}", file=out)
 
         # Add bonus section
         if "bonus" in report and report["bonus"]:
             bonus = report["bonus"]
-            text_lines.append(f"\n{'=' * 80}")
-            text_lines.append("BONUS INSIGHTS")
-            text_lines.append('=' * 80)
+            print(f"\n{'=' * 80}", file=out)
+            print("BONUS INSIGHTS", file=out)
+            print('=' * 80, file=out)
             if "one_sentence" in bonus:
-                text_lines.append(f"\nOne Sentence Summary:\n  {bonus['one_sentence']}")
+                print(f"\nOne Sentence Summary:\n  {bonus['one_sentence']}", file=out)
             if "key_takeaway" in bonus:
-                text_lines.append(f"\nKey Takeaway:\n  {bonus['key_takeaway']}")
+                print(f"\nKey Takeaway:\n  {bonus['key_takeaway']}", file=out)
             if "unexpected_learning" in bonus:
-                text_lines.append(f"\nUnexpected Learning:\n  {bonus['unexpected_learning']}")
-
-        text_content = "\n".join(text_lines)
+                print(f"\nUnexpected Learning:\n  {bonus['unexpected_learning']}", file=out)
 
-        # Create file in memory
-        buffer = BytesIO()
-        buffer.write(text_content.encode('utf-8'))
+        # Flush into buffer and let go of it without closing it;
+        # send_file streams it through the WSGI file wrapper
+        out.detach()
         buffer.seek(0)
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -3111,6 +4071,93 @@ def export_txt():
         return jsonify({"error": "Text export failed", "message": str(e)}), 500
 
 
+def print_html_to_pdf(page, html):
+    """Render HTML on a Chromium page and print it to PDF bytes."""
+    page.set_content(html, wait_until='load')
+    return page.pdf(format='Letter', print_background=True, prefer_css_page_size=True)
+
+
+def build_pdf_with_reportlab(report, sections, fields, generated_at):
+    """Fallback PDF layout for hosts without a Chromium install."""
+    # reportlab is large and only used by this fallback
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    # Create PDF in memory
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    story = []
+
+    # Get styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor='#000000',
+        spaceAfter=12,
+        alignment=1  # Center
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor='#50C878',
+        spaceAfter=8
+    )
+    subheading_style = ParagraphStyle(
+        'CustomSubHeading',
+        parent=styles['Heading3'],
+        fontSize=11,
+        textColor='#000000',
+        spaceAfter=6
+    )
+    body_style = styles['BodyText']
+
+    # Add title
+    story.append(Paragraph("SUPA REPORTS", title_style))
+    story.append(Paragraph(f"Analysis Report - {generated_at}", styles['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+
+    for key, title in sections:
+        if key in report and report[key]:
+            section = report[key]
+            story.append(Paragraph(title, heading_style))
+            story.append(Spacer(1, 0.1*inch))
+
+            for field_name, field_title in fields:
+                if field_name in section and section[field_name]:
+                    story.append(Paragraph(field_title, subheading_style))
+                    for item in section[field_name]:
+                        story.append(Paragraph(f"• {item}", body_style))
+                    story.append(Spacer(1, 0.1*inch))
+
+            story.append(Spacer(1, 0.2*inch))
+
+    # Add bonus section
+    if "bonus" in report and report["bonus"]:
+        bonus = report["bonus"]
+        story.append(Paragraph("Bonus Insights", heading_style))
+        story.append(Spacer(1, 0.1*inch))
+        if "one_sentence" in bonus:
+            story.append(Paragraph("<b>One Sentence Summary:</b>", subheading_style))
+            story.append(Paragraph(bonus['one_sentence'], body_style))
+            story.append(Spacer(1, 0.1*inch))
+        if "key_takeaway" in bonus:
+            story.append(Paragraph("<b>Key Takeaway:</b>", subheading_style))
+            story.append(Paragraph(bonus['key_takeaway'], body_style))
+            story.append(Spacer(1, 0.1*inch))
+        if "unexpected_learning" in bonus:
+            story.append(Paragraph("<b>Unexpected Learning:</b>", subheading_style))
+            story.append(Paragraph(bonus['unexpected_learning'], body_style))
+
+    # Build PDF
+    doc.build(story)
+    return buffer.getvalue()
+
+
 @app.route("/api/export-pdf", methods=["POST"])
 def export_pdf():
     """Export report as PDF file."""
@@ -3121,93 +4168,24 @@ def export_pdf():
         if not report:
             return jsonify({"error": "No report data provided"}), 400
 
-        # Create PDF in memory
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        story = []
-
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor='#000000',
-            spaceAfter=12,
-            alignment=1  # Center
-        )
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor='#50C878',
-            spaceAfter=8
-        )
-        subheading_style = ParagraphStyle(
-            'CustomSubHeading',
-            parent=styles['Heading3'],
-            fontSize=11,
-            textColor='#000000',
-            spaceAfter=6
-        )
-        body_style = styles['BodyText']
-
-        # Add title
-        story.append(Paragraph("SUPA REPORTS", title_style))
-        story.append(Paragraph(f"Analysis Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-        story.append(Spacer(1, 0.3*inch))
-
-        # Process each section
-        sections = {
-            "audience": "Audience & Targeting Insights",
-            "media": "Media & Channel Effectiveness",
-            "creative": "Creative Performance & Engagement",
-            "conversion": "Conversion & Performance Drivers",
-            "competitive": "Competitive & Market Insights",
-            "optimization": "Optimization & Next Steps"
-        }
-
-        for key, title in sections.items():
-            if key in report and report[key]:
-                section = report[key]
-                story.append(Paragraph(title, heading_style))
-                story.append(Spacer(1, 0.1*inch))
-
-                for field_name, field_title in [
-                    ("key_findings", "Key Findings"),
-                    ("supporting_data", "Supporting Data"),
-                    ("research_context", "Research Context"),
-                    ("implications", "Implications"),
-                    ("actions", "Actions")
-                ]:
-                    if field_name in section and section[field_name]:
-                        story.append(Paragraph(field_title, subheading_style))
-                        for item in section[field_name]:
-                            story.append(Paragraph(f"• {item}", body_style))
-                        story.append(Spacer(1, 0.1*inch))
-
-                story.append(Spacer(1, 0.2*inch))
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-        # Add bonus section
-        if "bonus" in report and report["bonus"]:
-            bonus = report["bonus"]
-            story.append(Paragraph("Bonus Insights", heading_style))
-            story.append(Spacer(1, 0.1*inch))
-            if "one_sentence" in bonus:
-                story.append(Paragraph("<b>One Sentence Summary:</b>", subheading_style))
-                story.append(Paragraph(bonus['one_sentence'], body_style))
-                story.append(Spacer(1, 0.1*inch))
-            if "key_takeaway" in bonus:
-                story.append(Paragraph("<b>Key Takeaway:</b>", subheading_style))
-                story.append(Paragraph(bonus['key_takeaway'], body_style))
-                story.append(Spacer(1, 0.1*inch))
-            if "unexpected_learning" in bonus:
-                story.append(Paragraph("<b>Unexpected Learning:</b>", subheading_style))
-                story.append(Paragraph(bonus['unexpected_learning'], body_style))
+        # Lay the report out as HTML and let headless Chromium print it
+        html = render_template(
+            "report_pdf.html",
+            report=report,
+            sections=EXPORT_SECTIONS,
+            fields=EXPORT_FIELDS,
+            generated_at=generated_at
+        )
+        try:
+            pdf_bytes = pdf_browser.run(print_html_to_pdf, html)
+        except Exception as e:
+            logger.warning("Chromium PDF rendering failed, falling back to reportlab: %s", e)
+            pdf_bytes = build_pdf_with_reportlab(report, EXPORT_SECTIONS, EXPORT_FIELDS, generated_at)
 
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
+        # Shares pdf_bytes' memory rather than copying it
+        buffer = BytesIO(pdf_bytes)
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"supareports_analysis_{timestamp}.pdf"
@@ -3228,6 +4206,10 @@ def export_pdf():
 @app.route("/api/export-docx", methods=["POST"])
 def export_docx():
     """Export report as Word document."""
+    from docx import Document
+    from docx.shared import RGBColor
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
     try:
         data = request.get_json()
         report = data.get("report", {})
@@ -3246,16 +4228,7 @@ def export_docx():
         subtitle.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
         # Process each section
-        sections = {
-            "audience": "Audience & Targeting Insights",
-            "media": "Media & Channel Effectiveness",
-            "creative": "Creative Performance & Engagement",
-            "conversion": "Conversion & Performance Drivers",
-            "competitive": "Competitive & Market Insights",
-            "optimization": "Optimization & Next Steps"
-        }
-
-        for key, title_text in sections.items():
+        for key, title_text in EXPORT_SECTIONS:
             if key in report and report[key]:
                 section = report[key]
 
@@ -3264,13 +4237,7 @@ def export_docx():
                 run = heading.runs[0]
                 run.font.color.rgb = RGBColor(80, 200, 120)  # Emerald color
 
-                for field_name, field_title in [
-                    ("key_findings", "Key Findings"),
-                    ("supporting_data", "Supporting Data"),
-                    ("research_context", "Research Context"),
-                    ("implications", "Implications"),
-                    ("actions", "Actions")
-                ]:
+                for field_name, field_title in EXPORT_FIELDS:
                     if field_name in section and section[field_name]:
                         doc.add_heading(field_title, 2)
                         for item in section[field_name]:
@@ -3323,6 +4290,15 @@ def request_entity_too_large(error):
     }), 413
 
 
+@app.errorhandler(429)
+def too_many_requests(error):
+    """Handle rate limit errors."""
+    return jsonify({
+        "error": "Too many requests, please try again later",
+        "limit": str(error.description)
+    }), 429
+
+
 @app.errorhandler(500)
 def internal_server_error(error):
     """Handle internal server errors."""
@@ -3346,6 +4322,7 @@ if __name__ == "__main__":
     print(f"Assistant ID: {ASSISTANT_ID or 'Will create new'}")
     print(f"Debug mode: {DEBUG}")
     print(f"Max file size: {MAX_FILE_SIZE / (1024 * 1024):.1f}MB")
+    print(f"Worker threads: {WAITRESS_THREADS}")
     print("=" * 70)
 
     # Use waitress for production-like server on macOS
@@ -3353,9 +4330,9 @@ if __name__ == "__main__":
         from waitress import serve
         print(f"\n🚀 Serving on http://localhost:{PORT}")
         print(f"Press Ctrl+C to stop\n")
-        serve(app, host="0.0.0.0", port=PORT)
+        serve(app, host="0.0.0.0", port=PORT, threads=WAITRESS_THREADS)
     except ImportError:
         print("\nWARNING: waitress not installed, falling back to Flask dev server")
         print(f"🚀 Serving on http://localhost:{PORT}")
         print(f"Press Ctrl+C to stop\n")
-        app.run(host="0.0.0.0", port=PORT, debug=DEBUG)
+        app.run(host="0.0.0.0", port=PORT, debug=DEBUG, threaded=True)
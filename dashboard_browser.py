@@ -0,0 +1,402 @@
+"""
+Long-lived Playwright browsers shared across requests
+"""
+import os
+import queue
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from scraper_logging import scraper_log
+
+# Browser arguments to bypass Google's automation detection
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-site-isolation-trials'
+]
+
+# Injected into every page before its own scripts run, to hide automation
+STEALTH_JS = """
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined
+});
+
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+);
+
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [1, 2, 3, 4, 5]
+});
+
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['en-US', 'en']
+});
+"""
+
+# Default timeouts for dashboard pages: navigation (override with SCRAPER_NAV_TIMEOUT_MS)
+# and other actions such as clicks and selector waits
+NAV_TIMEOUT_MS = int(os.getenv('SCRAPER_NAV_TIMEOUT_MS', '15000'))
+ACTION_TIMEOUT_MS = 10000
+
+# Browsers setup_google_auth.py can save a login for, in detection order
+AUTH_BROWSERS = ('firefox', 'chromium', 'webkit')
+
+# Requests dashboards don't need for extraction (set SCRAPER_ALLOW_ALL_RESOURCES=true to load everything)
+BLOCKED_RESOURCE_TYPES = {'font', 'media', 'websocket', 'eventsource'}
+BLOCKED_HOSTS = ('doubleclick.net', 'google-analytics.com', 'googletagmanager.com', 'facebook.net')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def block_unneeded_resources(route):
+    """Route handler aborting fonts, media, streams and ad/analytics beacons"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        return route.abort()
+    return route.continue_()
+
+
+@lru_cache(maxsize=4)
+def detect_auth_dir(base_dir):
+    """
+    Find which browser has saved authentication data
+
+    Supports multiple browsers (firefox, chromium, webkit). Only the first
+    entry of each profile directory is read, and the answer is cached per
+    base_dir since profiles are only created by setup_google_auth.py.
+
+    Returns:
+        Tuple of (browser_type, profile_dir, whether saved data was found)
+    """
+    for btype in AUTH_BROWSERS:
+        bdir = os.path.join(base_dir, f'browser_data_{btype}')
+        try:
+            with os.scandir(bdir) as entries:
+                if next(entries, None) is not None:
+                    scraper_log.info("  ℹ️ Found %s authentication data", btype.capitalize())
+                    return btype, bdir, True
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+    # If no auth data found, default to Chromium
+    scraper_log.info("  ℹ️ No authentication found, using Chromium (headless)")
+    return 'chromium', os.path.join(base_dir, 'browser_data_chromium'), False
+
+
+class BrowserThread:
+    """
+    Keep one browser context alive between requests and run work on it
+
+    Playwright's sync API is bound to the thread that started it, so the
+    browser lives on a dedicated thread and every call is handed to that
+    thread through a queue. The browser is launched on first use and
+    relaunched automatically if it crashes or is closed. Subclasses
+    decide how the context is launched.
+    """
+
+    thread_name = 'playwright-browser'
+
+    def __init__(self, name=None):
+        self.name = name or self.thread_name
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._tasks = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+        self._thread.start()
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Run fn(page, *args, **kwargs) on the browser thread.
+
+        Blocks until the call finishes and returns its result (or raises its exception).
+        """
+        future = Future()
+        self._tasks.put((future, fn, args, kwargs))
+        return future.result()
+
+    def close(self, timeout=10):
+        """Close the browser and stop Playwright (safe to call at exit)"""
+        future = Future()
+        self._tasks.put((future, None, (), {}))
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            scraper_log.error("Error closing %s: %s", self.name, e)
+
+    def _worker(self):
+        """Process queued calls forever on the thread that owns Playwright"""
+        while True:
+            future, fn, args, kwargs = self._tasks.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if fn is None:
+                    self._shutdown()
+                    future.set_result(None)
+                    continue
+                future.set_result(fn(self._get_page(), *args, **kwargs))
+            except BaseException as e:
+                # The page may be stuck mid-navigation; start the next call on a
+                # fresh page but keep the context (and its login) alive
+                self._discard_page()
+                future.set_exception(e)
+
+    def warm_up(self):
+        """Launch the browser in the background so the first call doesn't wait for it"""
+        self._tasks.put((Future(), lambda page: None, (), {}))
+
+    def _get_page(self):
+        """Return the shared page, launching the browser if needed"""
+        if self._context is None:
+            self._start()
+        if self._page is None or self._page.is_closed():
+            # Use existing page if available (persistent context may have one already)
+            self._page = self._context.pages[0] if self._context.pages else self._context.new_page()
+        return self._page
+
+    def _discard_page(self):
+        """Close the current page, leaving the context running"""
+        page, self._page = self._page, None
+        if page is not None and self._context is not None:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def _start(self):
+        """Start Playwright if needed and launch a fresh context"""
+        if self._playwright is None:
+            # Imported on first launch so the web app starts without loading Playwright
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+        if self._browser is not None:
+            # Left over from a launch whose context was closed
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+        try:
+            context = self._launch(self._playwright)
+        except Exception:
+            self._shutdown()
+            raise
+
+        self._prepare_context(context)
+
+        # Relaunch on next use if the browser goes away
+        context.on('close', lambda _: self._reset())
+        self._context = context
+
+    def _launch(self, playwright):
+        """Launch and return a browser context (set self._browser if one is created)"""
+        raise NotImplementedError
+
+    def _prepare_context(self, context):
+        """Hook for one-time setup of a newly launched context"""
+        pass
+
+    def _reset(self):
+        """Forget the closed context so the next call relaunches it"""
+        self._context = None
+        self._page = None
+
+    def _shutdown(self):
+        """Close everything owned by this thread"""
+        for resource in (self._context, self._browser):
+            if resource is not None:
+                try:
+                    resource.close()
+                except Exception:
+                    traceback.print_exc()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                traceback.print_exc()
+        self._playwright = None
+        self._browser = None
+        self._reset()
+
+
+class DashboardBrowser(BrowserThread):
+    """
+    Browser for dashboard scraping, reusing saved Google authentication
+
+    The primary browser owns the persistent profile directory. A browser
+    profile can only be opened by one process, so extra browsers are given
+    an auth_source and start from a copy of its cookies and storage instead.
+    """
+
+    thread_name = 'playwright-dashboards'
+
+    def __init__(self, base_dir, auth_source=None, name=None):
+        self.base_dir = base_dir
+        self.auth_source = auth_source
+        self.browser_type = None
+        self.auth_state = None
+        self._auth_ready = threading.Event()
+        super().__init__(name=name)
+
+    def get_auth_state(self):
+        """Return (storage_state, browser_type) captured when this browser launched"""
+        if not self._auth_ready.is_set():
+            # Make sure a launch happens, but don't queue behind a running scrape:
+            # the state is captured as soon as the context is up
+            future = Future()
+            self._tasks.put((future, lambda page: None, (), {}))
+            while not self._auth_ready.wait(0.5):
+                if future.done():
+                    future.result()  # Re-raises a failed launch
+                    break
+        return self.auth_state, self.browser_type
+
+    def _launch(self, playwright):
+        """Launch the persistent context holding the dashboard login"""
+        if self.auth_source is not None:
+            return self._launch_from_auth_source(playwright)
+
+        browser_type, auth_dir, has_auth = detect_auth_dir(self.base_dir)
+        if not has_auth:
+            os.makedirs(auth_dir, exist_ok=True)
+
+        # Select the browser
+        browser_engine = getattr(playwright, browser_type)
+        browser_args = BROWSER_ARGS if browser_type == 'chromium' else []
+
+        # Use persistent context to maintain Google authentication
+        # This allows the user to log in once and reuse the session
+        # Can use headless mode since authentication is already saved
+        headless_mode = os.getenv('SCRAPER_HEADLESS', 'true').lower() == 'true'
+
+        try:
+            context = browser_engine.launch_persistent_context(
+                auth_dir,
+                headless=headless_mode,  # Use headless by default (can be changed in .env)
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=USER_AGENT,
+                locale='en-US',
+                args=browser_args
+            )
+
+            scraper_log.info("  ℹ️ Using persistent %s context (headless=%s)", browser_type.capitalize(), headless_mode)
+
+        except Exception as e:
+            scraper_log.warning("  ⚠️ Could not create persistent context: %s", e)
+            scraper_log.info("  ℹ️ Falling back to non-persistent mode")
+            # Fallback to regular browser if persistent context fails
+            self._browser = browser_engine.launch(headless=True, args=browser_args)
+            context = self._browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=USER_AGENT,
+                locale='en-US'
+            )
+
+        self.browser_type = browser_type
+        self.auth_state = context.storage_state()
+        self._auth_ready.set()
+        return context
+
+    def _launch_from_auth_source(self, playwright):
+        """Launch a regular browser seeded with the primary browser's login"""
+        auth_state, browser_type = self.auth_source.get_auth_state()
+        browser_engine = getattr(playwright, browser_type)
+        headless_mode = os.getenv('SCRAPER_HEADLESS', 'true').lower() == 'true'
+
+        self._browser = browser_engine.launch(
+            headless=headless_mode,
+            args=BROWSER_ARGS if browser_type == 'chromium' else []
+        )
+        context = self._browser.new_context(
+            storage_state=auth_state,
+            viewport={'width': 1920, 'height': 1080},
+            user_agent=USER_AGENT,
+            locale='en-US'
+        )
+        scraper_log.info("  ℹ️ %s: %s context seeded from saved login", self.name, browser_type.capitalize())
+
+        self.browser_type = browser_type
+        return context
+
+    def _prepare_context(self, context):
+        """Hide automation, apply short default timeouts and block unneeded requests (every page)"""
+        context.add_init_script(STEALTH_JS)
+        context.set_default_navigation_timeout(NAV_TIMEOUT_MS)
+        context.set_default_timeout(ACTION_TIMEOUT_MS)
+        if os.getenv('SCRAPER_ALLOW_ALL_RESOURCES', 'false').lower() != 'true':
+            context.route('**/*', block_unneeded_resources)
+
+
+class DashboardBrowserPool:
+    """
+    Spread dashboard scrapes over several browsers running side by side
+
+    Each browser lives on its own thread, so up to `size` dashboards load
+    and render at once; further scrapes wait for the next free browser.
+    Secondary browsers are only launched once there is work for them.
+    """
+
+    def __init__(self, base_dir, size=1):
+        primary = DashboardBrowser(base_dir)
+        self.browsers = [primary] + [
+            DashboardBrowser(base_dir, auth_source=primary, name=f'playwright-dashboards-{i}')
+            for i in range(1, max(1, size))
+        ]
+        self._idle = queue.Queue()
+        for browser in self.browsers:
+            self._idle.put(browser)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.browsers), thread_name_prefix='dashboard-scrape')
+
+    @property
+    def browser_type(self):
+        """Browser engine in use for the saved login"""
+        return self.browsers[0].browser_type
+
+    def map(self, fn, items):
+        """
+        Run fn(page, item) for every item on the first free browser.
+
+        Returns the results in the same order as items.
+        """
+        futures = [self._executor.submit(self._run_on_idle_browser, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def warm_up(self):
+        """Launch the primary browser ahead of the first scrape"""
+        self.browsers[0].warm_up()
+
+    def close(self):
+        """Close every browser in the pool"""
+        for browser in self.browsers:
+            browser.close()
+
+    def _run_on_idle_browser(self, fn, item):
+        """Borrow a free browser for one call"""
+        browser = self._idle.get()
+        try:
+            return browser.run(fn, item)
+        finally:
+            self._idle.put(browser)
+
+
+class PdfBrowser(BrowserThread):
+    """Headless Chromium for printing HTML to PDF (page.pdf() is Chromium-only)"""
+
+    thread_name = 'playwright-pdf'
+
+    def _launch(self, playwright):
+        """Launch a plain headless Chromium context"""
+        self._browser = playwright.chromium.launch(headless=True, args=['--disable-dev-shm-usage'])
+        return self._browser.new_context()
@@ -0,0 +1,90 @@
+"""
+In-process background job queue for long-running Supa Reports work
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Run callables on a dedicated worker pool and track their state by job ID"""
+
+    def __init__(self, name, max_workers=2, result_ttl=3600):
+        self.name = name
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{name}-worker')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()  # Job running on each worker thread
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) on the worker pool.
+
+        Returns:
+            Job ID that can be passed to get() to check progress
+        """
+        self._prune()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'state': 'queued',
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None,
+            'progress': None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        """Return a snapshot of the job, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update_progress(self, **progress):
+        """
+        Merge progress details (e.g. stage='uploading') into the job running
+        on the calling worker thread. Does nothing outside a job.
+        """
+        job = getattr(self._current, 'job', None)
+        if job is None:
+            return
+        with self._lock:
+            job['progress'] = {**(job['progress'] or {}), **progress}
+
+    def _run(self, job, fn, args, kwargs):
+        """Execute a job on a worker thread and record its outcome"""
+        job['state'] = 'running'
+        job['started_at'] = time.time()
+        self._current.job = job
+        try:
+            job['result'] = fn(*args, **kwargs)
+            job['state'] = 'finished'
+        except Exception as e:
+            logger.exception("Error in %s job %s", self.name, job['id'])
+            job['error'] = str(e)
+            job['state'] = 'failed'
+        finally:
+            self._current.job = None
+            job['finished_at'] = time.time()
+
+    def _prune(self):
+        """Forget finished jobs whose results are older than result_ttl"""
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['finished_at'] and job['finished_at'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -3,10 +3,100 @@ Enhanced Looker Studio data extractor with specific selectors for paid media met
 """
 import time
 import os
-import tempfile
-from typing import Dict, List, Any
-from PIL import Image
-import pytesseract
+import io
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+from scraper_logging import scraper_log
+
+
+# Fingerprint of what is rendered: visible text plus the number of chart surfaces
+PAGE_FINGERPRINT_JS = """() => {
+    const text = document.body ? document.body.innerText : '';
+    return text + '|' + document.querySelectorAll('canvas, svg, table').length;
+}"""
+
+
+def wait_for_stable(page, quiet_ms=1500, max_wait=20000, interval_ms=500, max_interval_ms=2000):
+    """
+    Wait until the page stops changing instead of sleeping for a fixed time.
+
+    Polls a hash of the rendered text/charts and returns as soon as it has been
+    unchanged for quiet_ms. The poll interval backs off exponentially while
+    the page is quiet and resets whenever new content appears.
+
+    Returns:
+        True if the page settled, False if max_wait ran out first
+    """
+    start = time.monotonic()
+    last_hash = None
+    last_change = start
+    interval = interval_ms
+
+    while True:
+        try:
+            fingerprint = page.evaluate(PAGE_FINGERPRINT_JS)
+        except Exception:
+            fingerprint = ''  # Page is mid-navigation; treat as changing
+        content_hash = hashlib.md5(fingerprint.encode('utf-8', 'ignore')).hexdigest()
+
+        now = time.monotonic()
+        if content_hash != last_hash:
+            last_hash = content_hash
+            last_change = now
+            interval = interval_ms
+        elif (now - last_change) * 1000 >= quiet_ms:
+            return True
+        else:
+            interval = min(interval * 2, max_interval_ms)
+
+        if (now - start) * 1000 >= max_wait:
+            return False
+        time.sleep(interval / 1000)
+
+
+# Tesseract settings tuned for dashboard data
+# --oem 3: Use default OCR Engine Mode (LSTM)
+# --psm 6: Assume a single uniform block of text
+OCR_CONFIG = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
+
+# Tesseract runs as a subprocess, so threads are enough to OCR several screenshots
+# at once. The pool is shared by every extractor so concurrent dashboards can't
+# start more Tesseract processes than there are CPUs.
+_ocr_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix='ocr')
+
+
+def ocr_screenshot(png_bytes: bytes) -> Dict[str, Any]:
+    """Run OCR on a PNG screenshot and return the extracted text"""
+    ocr_data = {
+        'extracted_text': '',
+        'method': 'OCR (Tesseract)'
+    }
+
+    try:
+        # OCR libraries are only loaded once a dashboard is actually scraped
+        from PIL import Image
+        import pytesseract
+
+        with Image.open(io.BytesIO(png_bytes)) as image:
+            scraper_log.info("     Image size: %sx%s pixels", image.size[0], image.size[1])
+            text = pytesseract.image_to_string(image, config=OCR_CONFIG)
+
+        if text.strip():
+            ocr_data['extracted_text'] = text.strip()
+            ocr_data['character_count'] = len(text)
+            # Count lines with content
+            lines_with_content = [line for line in text.split('\n') if line.strip()]
+            ocr_data['lines_extracted'] = len(lines_with_content)
+            scraper_log.info("     ✓ OCR extracted %s characters from %s lines", len(text), len(lines_with_content))
+        else:
+            scraper_log.warning("     ⚠️ OCR found no text")
+
+    except Exception as e:
+        scraper_log.exception("     ⚠️ OCR extraction failed: %s", e)
+        ocr_data['error'] = str(e)
+
+    return ocr_data
 
 
 class LookerStudioExtractor:
@@ -14,26 +104,28 @@ class LookerStudioExtractor:
     
     def __init__(self, page):
         self.page = page
+        self._ocr_jobs = {}  # Screenshot digest -> Future with its OCR result
         
     def wait_for_dashboard_load(self, timeout=30):
         """Wait for Looker Studio dashboard to fully load"""
         try:
             # Wait for common Looker Studio elements with longer timeout
             self.page.wait_for_selector('canvas, table, [class*="chart"]', timeout=timeout * 1000)
-            print("     Dashboard elements detected, waiting for full render...")
-            time.sleep(25)  # Wait 25 seconds for dynamic content to fully render
+            scraper_log.info("     Dashboard elements detected, waiting for full render...")
+            # Wait (up to 25 seconds) until dynamic content stops changing
+            wait_for_stable(self.page, quiet_ms=2000, max_wait=25000)
         except Exception as e:
-            print(f"Warning: Dashboard load wait timeout: {e}")
-            print("     Continuing with extraction anyway...")
+            scraper_log.warning("Warning: Dashboard load wait timeout: %s", e)
+            scraper_log.info("     Continuing with extraction anyway...")
             # Still continue even if timeout - might have loaded partially
-            time.sleep(25)  # Still wait even if selector not found
+            wait_for_stable(self.page, quiet_ms=2000, max_wait=25000)
 
     def quick_scroll(self, max_scrolls=10):
         """Visible chunked scrolling - scrolls the actual scrollable container"""
         try:
             import time
 
-            print("     🔽 Finding scrollable container...")
+            scraper_log.info("     🔽 Finding scrollable container...")
 
             # Find the scrollable container (Looker uses .mainBlock)
             container_info = self.page.evaluate("""
@@ -74,8 +166,8 @@ class LookerStudioExtractor:
             viewport_height = container_info['viewportHeight']
             selector = container_info['selector']
 
-            print(f"     Found: {selector}")
-            print(f"     Total height: {total_height}px, Visible: {viewport_height}px")
+            scraper_log.info("     Found: %s", selector)
+            scraper_log.info("     Total height: %spx, Visible: %spx", total_height, viewport_height)
 
             # Flash background to show scrolling is starting
             self.page.evaluate("""
@@ -107,11 +199,11 @@ class LookerStudioExtractor:
                 else:
                     current_pos = self.page.evaluate("window.scrollY")
 
-                print(f"     📍 Step {step}/{scroll_steps}: Scrolled to {current_pos}px")
+                scraper_log.info("     📍 Step %s/%s: Scrolled to %spx", step, scroll_steps, current_pos)
                 time.sleep(2.5)  # Increased from 1.5s to 2.5s for lazy loading
 
             # Final scroll to absolute bottom with verification
-            print("     📍 Scrolling to absolute bottom...")
+            scraper_log.info("     📍 Scrolling to absolute bottom...")
             if container_info['found']:
                 self.page.evaluate(f"""
                     const container = document.querySelector('{selector}');
@@ -122,7 +214,7 @@ class LookerStudioExtractor:
             time.sleep(3)  # Increased wait for lazy content
 
             # Repeat scroll to bottom until position stops changing (smart detection)
-            print("     📍 Ensuring we reach absolute bottom (smart detection)...")
+            scraper_log.info("     📍 Ensuring we reach absolute bottom (smart detection)...")
             last_scroll_pos = -1
             attempts = 0
             max_attempts = 10
@@ -158,7 +250,7 @@ class LookerStudioExtractor:
 
                 # Check if we've reached the bottom and position hasn't changed
                 if current_pos >= max_scroll - 10 and current_pos == last_scroll_pos:
-                    print(f"     ✅ Reached bottom! Position: {current_pos}px / {max_scroll}px")
+                    scraper_log.info("     ✅ Reached bottom! Position: %spx / %spx", current_pos, max_scroll)
                     break
 
                 # Scroll to bottom again
@@ -170,7 +262,7 @@ class LookerStudioExtractor:
                 else:
                     self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
 
-                print(f"     🔽 Attempt {attempts + 1}: Position {current_pos}px / {max_scroll}px")
+                scraper_log.info("     🔽 Attempt %s: Position %spx / %spx", attempts + 1, current_pos, max_scroll)
                 last_scroll_pos = current_pos
                 attempts += 1
                 time.sleep(2)  # Wait for lazy content to load
@@ -184,10 +276,10 @@ class LookerStudioExtractor:
             else:
                 final_pos = self.page.evaluate("window.scrollY")
 
-            print(f"     ✅ Final scroll position: {final_pos}px")
+            scraper_log.info("     ✅ Final scroll position: %spx", final_pos)
 
             # Scroll back to top (faster - less critical)
-            print("     📍 Scrolling back to top...")
+            scraper_log.info("     📍 Scrolling back to top...")
             if container_info['found']:
                 self.page.evaluate(f"""
                     const container = document.querySelector('{selector}');
@@ -197,16 +289,16 @@ class LookerStudioExtractor:
                 self.page.evaluate("window.scrollTo(0, 0)")
             time.sleep(1)
 
-            print("     ✅ Scroll complete!")
+            scraper_log.info("     ✅ Scroll complete!")
 
         except Exception as e:
-            print(f"     ⚠️  Scroll error (non-critical): {e}")
+            scraper_log.warning("     ⚠️  Scroll error (non-critical): %s", e)
             pass  # Fail silently - scrolling is optional
 
     def scroll_page_fully(self):
         """Scroll through entire page to load lazy-loaded content and ensure all data is visible"""
         try:
-            print("     🔽 Scrolling page to load all content...")
+            scraper_log.info("     🔽 Scrolling page to load all content...")
 
             # Find the scrollable container - Looker Studio uses specific elements
             # Try to find the main content container
@@ -225,14 +317,14 @@ class LookerStudioExtractor:
                     element = self.page.query_selector(selector)
                     if element:
                         scrollable_container = selector
-                        print(f"     Found scrollable container: {selector}")
+                        scraper_log.info("     Found scrollable container: %s", selector)
                         break
                 except:
                     continue
 
             if not scrollable_container:
                 scrollable_container = 'body'
-                print(f"     Using default: body")
+                scraper_log.info("     Using default: body")
 
             # Enable smooth scrolling for visibility
             self.page.evaluate("""
@@ -246,13 +338,13 @@ class LookerStudioExtractor:
                     return el ? el.scrollHeight : document.body.scrollHeight;
                 }})()
             """)
-            print(f"     Initial scroll height: {last_height}px")
+            scraper_log.info("     Initial scroll height: %spx", last_height)
 
             # Scroll in steps to trigger lazy loading - SLOW AND VISIBLE
             scroll_steps = 10  # More steps for better visibility
             for step in range(1, scroll_steps + 1):
                 scroll_position = int(last_height * (step / scroll_steps))
-                print(f"     Scrolling to position {scroll_position}px ({step}/{scroll_steps})...")
+                scraper_log.info("     Scrolling to position %spx (%s/%s)...", scroll_position, step, scroll_steps)
 
                 # Scroll both window AND container for maximum visibility
                 self.page.evaluate(f"""
@@ -273,7 +365,7 @@ class LookerStudioExtractor:
                 time.sleep(2)  # Longer wait to make scrolling visible
 
             # Final scroll to absolute bottom
-            print(f"     Scrolling to absolute bottom...")
+            scraper_log.info("     Scrolling to absolute bottom...")
             self.page.evaluate(f"""
                 (() => {{
                     const container = document.querySelector('{scrollable_container}');
@@ -299,13 +391,13 @@ class LookerStudioExtractor:
                 }})()
             """)
             if new_height > last_height:
-                print(f"     ✓ Page expanded from {last_height}px to {new_height}px - NEW CONTENT LOADED!")
+                scraper_log.info("     ✓ Page expanded from %spx to %spx - NEW CONTENT LOADED!", last_height, new_height)
                 time.sleep(2)  # Extra wait for new content to render
             else:
-                print(f"     Page height unchanged: {new_height}px")
+                scraper_log.info("     Page height unchanged: %spx", new_height)
 
             # Scroll back to top for screenshot consistency
-            print(f"     Scrolling back to top...")
+            scraper_log.info("     Scrolling back to top...")
             self.page.evaluate(f"""
                 (() => {{
                     window.scrollTo({{
@@ -321,10 +413,10 @@ class LookerStudioExtractor:
             """)
             time.sleep(2)
 
-            print("     ✅ Full page scroll complete")
+            scraper_log.info("     ✅ Full page scroll complete")
 
         except Exception as e:
-            print(f"     ⚠️ Warning: Scroll failed: {e}")
+            scraper_log.warning("     ⚠️ Warning: Scroll failed: %s", e)
     
     def extract_tables(self) -> List[Dict[str, Any]]:
         """Extract all table data from the dashboard"""
@@ -363,11 +455,11 @@ class LookerStudioExtractor:
                         tables.append(table_data)
                         
                 except Exception as e:
-                    print(f"Error extracting table {idx}: {e}")
+                    scraper_log.error("Error extracting table %s: %s", idx, e)
                     continue
                     
         except Exception as e:
-            print(f"Error finding tables: {e}")
+            scraper_log.error("Error finding tables: %s", e)
         
         return tables
     
@@ -419,7 +511,7 @@ class LookerStudioExtractor:
                         continue
                         
             except Exception as e:
-                print(f"Error with selector {selector}: {e}")
+                scraper_log.error("Error with selector %s: %s", selector, e)
                 continue
         
         return metrics
@@ -463,8 +555,9 @@ class LookerStudioExtractor:
                         # For SVG charts, try to extract text labels
                         if element.evaluate('el => el.tagName') == 'svg':
                             try:
+                                # SVG <text> nodes aren't HTML elements, so inner_text() raises on them
                                 labels = element.query_selector_all('text')
-                                label_texts = [label.inner_text().strip() for label in labels if label.inner_text().strip()]
+                                label_texts = [text for text in (label.text_content().strip() for label in labels) if text]
                                 if label_texts:
                                     chart_data['labels'] = label_texts
                             except:
@@ -473,67 +566,95 @@ class LookerStudioExtractor:
                         charts.append(chart_data)
                         
                     except Exception as e:
-                        print(f"Error extracting chart: {e}")
+                        scraper_log.error("Error extracting chart: %s", e)
                         continue
                         
         except Exception as e:
-            print(f"Error finding charts: {e}")
+            scraper_log.error("Error finding charts: %s", e)
         
         return charts
     
-    def extract_text_via_ocr(self) -> Dict[str, Any]:
-        """Extract text from dashboard using OCR on screenshots"""
-        ocr_data = {
-            'extracted_text': '',
-            'method': 'OCR (Tesseract)'
+    def extract_view_data(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract the tables, metrics and charts the current view exposes in the DOM"""
+        return {
+            'tables': self.extract_tables(),
+            'metrics': self.extract_metrics(),
+            'charts': self.extract_charts()
         }
 
-        try:
-            print("     Running OCR on dashboard screenshot...")
+    @staticmethod
+    def view_needs_ocr(view: Dict[str, List[Dict]], ocr_min_dom_items: Optional[int]) -> bool:
+        """Decide whether a view's DOM data leaves anything for OCR to read
 
-            # Scroll to top first to ensure we start from the beginning
-            self.page.evaluate("window.scrollTo(0, 0)")
-            time.sleep(1)
+        Canvas charts are only pixels to the DOM, so a view with one always needs
+        OCR, and only charts with text labels count towards its DOM items.
 
-            # Take a screenshot of the entire visible page
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-                screenshot_path = tmp_file.name
-
-            # Screenshot the full page (not just viewport)
-            self.page.screenshot(path=screenshot_path, full_page=True)
-            print(f"     Screenshot saved to: {screenshot_path}")
-
-            # Run OCR on the screenshot
-            image = Image.open(screenshot_path)
-            print(f"     Image size: {image.size[0]}x{image.size[1]} pixels")
-
-            # Use pytesseract to extract text
-            # Using enhanced config for better accuracy on dashboard data
-            # --oem 3: Use default OCR Engine Mode (LSTM)
-            # --psm 6: Assume a single uniform block of text
-            custom_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
-            text = pytesseract.image_to_string(image, config=custom_config)
-
-            # Clean up screenshot
-            os.unlink(screenshot_path)
-
-            if text.strip():
-                ocr_data['extracted_text'] = text.strip()
-                ocr_data['character_count'] = len(text)
-                # Count lines with content
-                lines_with_content = [line for line in text.split('\n') if line.strip()]
-                ocr_data['lines_extracted'] = len(lines_with_content)
-                print(f"     ✓ OCR extracted {len(text)} characters from {len(lines_with_content)} lines")
-            else:
-                print(f"     ⚠️ OCR found no text")
+        Args:
+            view: Tables, metrics and charts extracted from the view
+            ocr_min_dom_items: DOM items needed to skip OCR (None: always OCR)
+        """
+        if ocr_min_dom_items is None:
+            return True
+        if any(chart.get('type') == 'CANVAS' for chart in view['charts']):
+            return True
+        labelled_charts = sum(1 for chart in view['charts'] if chart.get('labels'))
+        return len(view['tables']) + len(view['metrics']) + labelled_charts < ocr_min_dom_items
+
+    def submit_ocr(self) -> Optional[Future]:
+        """Screenshot the dashboard and start OCR on it in the background
+
+        Returns:
+            Future resolving to the OCR result, or None if the screenshot is
+            identical to one already submitted for this dashboard
+        """
+        scraper_log.info("     Running OCR on dashboard screenshot...")
 
+        # Scroll to top first to ensure we start from the beginning
+        self.page.evaluate("window.scrollTo(0, 0)")
+        time.sleep(1)
+
+        # Screenshot the full page (not just viewport), kept in memory
+        png_bytes = self.page.screenshot(full_page=True)
+
+        # Tabs that didn't change the view produce the same image; OCR it once
+        digest = hashlib.blake2b(png_bytes, digest_size=16).digest()
+        if digest in self._ocr_jobs:
+            scraper_log.info("     Screenshot identical to an earlier view, skipping OCR")
+            return None
+
+        future = _ocr_executor.submit(ocr_screenshot, png_bytes)
+        self._ocr_jobs[digest] = future
+        return future
+
+    def extract_text_via_ocr(self) -> Dict[str, Any]:
+        """Extract text from dashboard using OCR on screenshots"""
+        try:
+            future = self.submit_ocr()
         except Exception as e:
-            print(f"     ⚠️ OCR extraction failed: {e}")
-            import traceback
-            traceback.print_exc()
-            ocr_data['error'] = str(e)
+            scraper_log.exception("     ⚠️ OCR extraction failed: %s", e)
+            return {'extracted_text': '', 'method': 'OCR (Tesseract)', 'error': str(e)}
+
+        if future is None:
+            return {'extracted_text': '', 'method': 'OCR (Tesseract)', 'duplicate': True}
+        return future.result()
+
+    @staticmethod
+    def _add_ocr_result(ocr_text: List[Dict], source: str, future: Future) -> int:
+        """Wait for a background OCR job and record its text under source
 
-        return ocr_data
+        Returns:
+            Number of characters extracted
+        """
+        ocr_result = future.result()
+        if not ocr_result.get('extracted_text'):
+            return 0
+        char_count = ocr_result.get('character_count', 0)
+        ocr_text.append({
+            'source': source,
+            'text': ocr_result['extracted_text'],
+            'char_count': char_count
+        })
+        return char_count
 
     def extract_filters(self) -> List[Dict[str, Any]]:
         """Extract active filters and their values"""
@@ -572,7 +693,7 @@ class LookerStudioExtractor:
                         continue
                         
         except Exception as e:
-            print(f"Error extracting filters: {e}")
+            scraper_log.error("Error extracting filters: %s", e)
         
         return filters
     
@@ -604,18 +725,27 @@ class LookerStudioExtractor:
         
         return metadata
     
-    def explore_navigation(self, max_clicks=20, enable_ocr=False) -> List[str]:
+    def explore_navigation(self, max_clicks=20, enable_ocr=False, ocr_min_dom_items=None) -> tuple:
         """Click through navigation elements to discover hidden data
 
         Args:
             max_clicks: Maximum number of navigation elements to click
             enable_ocr: Whether to run OCR on each tab
+            ocr_min_dom_items: Skip OCR on tabs whose DOM exposes at least this
+                many items (see view_needs_ocr; default: OCR every tab)
+
+        Returns:
+            (explored tab names, OCR results, DOM data of each explored tab,
+            tab names whose OCR was skipped)
         """
         explored = []
         ocr_results = []  # Store OCR from each tab
+        ocr_jobs = []  # (tab text, Future) for OCR still running
+        tab_views = []  # Tables/metrics/charts read from each tab's DOM
+        ocr_skipped = []
 
         try:
-            print("🔍 Searching for navigation tabs...")
+            scraper_log.info("🔍 Searching for navigation tabs...")
 
             # Enhanced selectors for Looker Studio navigation, including left panels
             # Focus on finding numbered page navigation items
@@ -658,13 +788,13 @@ class LookerStudioExtractor:
                         except:
                             continue
                 except Exception as e:
-                    print(f"     Warning with selector '{selector}': {e}")
+                    scraper_log.warning("     Warning with selector '%s': %s", selector, e)
                     continue
 
             # Additional strategy: find clickable elements with single-digit or short text on the left side
             # These are likely page numbers in Looker Studio's left navigation
             try:
-                print("     Searching for numbered page elements...")
+                scraper_log.info("     Searching for numbered page elements...")
                 potential_pages = self.page.evaluate("""() => {
                     const elements = Array.from(document.querySelectorAll('*'));
                     return elements
@@ -689,7 +819,7 @@ class LookerStudioExtractor:
                 }""")
 
                 if potential_pages:
-                    print(f"     Found {len(potential_pages)} potential page elements on left side")
+                    scraper_log.info("     Found %s potential page elements on left side", len(potential_pages))
                     # Try to get these elements and add them to nav_elements
                     for page_info in potential_pages:
                         text = page_info['text']
@@ -703,15 +833,15 @@ class LookerStudioExtractor:
                             except:
                                 pass
             except Exception as e:
-                print(f"     Warning finding numbered pages: {e}")
+                scraper_log.warning("     Warning finding numbered pages: %s", e)
 
-            print(f"     Found {len(nav_elements)} unique navigation elements")
+            scraper_log.info("     Found %s unique navigation elements", len(nav_elements))
 
             # Click through visible navigation elements
             for idx, (element, element_text) in enumerate(nav_elements[:max_clicks]):
                 try:
                     if element.is_visible() and element.is_enabled():
-                        print(f"     📑 Clicking tab {idx + 1}/{min(len(nav_elements), max_clicks)}: '{element_text}'")
+                        scraper_log.info("     📑 Clicking tab %s/%s: '%s'", idx + 1, min(len(nav_elements), max_clicks), element_text)
 
                         # Scroll element into view before clicking
                         element.scroll_into_view_if_needed()
@@ -721,53 +851,67 @@ class LookerStudioExtractor:
                         element.click()
 
                         # Wait for dashboard content to fully load after tab change
-                        print(f"        Waiting for content to load...")
-                        time.sleep(8)  # Wait 8 seconds for data to render and animations to complete
+                        scraper_log.info("        Waiting for content to load...")
+                        wait_for_stable(self.page, max_wait=8000)  # Up to 8 seconds for data to render
 
                         # Multiple scrolls to load ALL lazy content on this tab
                         self.quick_scroll()
 
                         explored.append(element_text)
-                        print(f"        ✓ Loaded '{element_text}'")
-
-                        # Run OCR on this tab if enabled
-                        if enable_ocr:
+                        scraper_log.info("        ✓ Loaded '%s'", element_text)
+
+                        # Read the tab's DOM now, before the next click replaces it
+                        view = self.extract_view_data()
+                        tab_views.append(view)
+
+                        # Run OCR on this tab if enabled and its DOM doesn't already have
+                        # the data (in the background, so the next tab is clicked while
+                        # Tesseract works on this one)
+                        if enable_ocr and not self.view_needs_ocr(view, ocr_min_dom_items):
+                            scraper_log.info("        DOM exposes the data on '%s', skipping OCR", element_text)
+                            ocr_skipped.append(f'tab_{element_text}')
+                        elif enable_ocr:
                             try:
-                                print(f"        📸 Running OCR on '{element_text}'...")
-                                ocr_result = self.extract_text_via_ocr()
-                                if ocr_result.get('extracted_text'):
-                                    ocr_results.append({
-                                        'source': f'tab_{element_text}',
-                                        'text': ocr_result['extracted_text'],
-                                        'char_count': ocr_result.get('character_count', 0)
-                                    })
-                                    print(f"        ✓ OCR: {ocr_result.get('character_count', 0)} chars from '{element_text}'")
+                                scraper_log.info("        📸 Running OCR on '%s'...", element_text)
+                                ocr_job = self.submit_ocr()
+                                if ocr_job is not None:
+                                    ocr_jobs.append((element_text, ocr_job))
                             except Exception as ocr_error:
-                                print(f"        ⚠️ OCR failed for '{element_text}': {ocr_error}")
+                                scraper_log.warning("        ⚠️ OCR failed for '%s': %s", element_text, ocr_error)
 
                 except Exception as e:
-                    print(f"        ⚠️ Error clicking '{element_text}': {e}")
+                    scraper_log.error("        ⚠️ Error clicking '%s': %s", element_text, e)
                     continue
 
-            print(f"✓ Explored {len(explored)} tabs/pages")
+            # Collect the background OCR results in tab order
+            for element_text, ocr_job in ocr_jobs:
+                char_count = self._add_ocr_result(ocr_results, f'tab_{element_text}', ocr_job)
+                if char_count:
+                    scraper_log.info("        ✓ OCR: %s chars from '%s'", char_count, element_text)
+
+            scraper_log.info("✓ Explored %s tabs/pages", len(explored))
             if enable_ocr and ocr_results:
                 total_ocr_chars = sum(r.get('char_count', 0) for r in ocr_results)
-                print(f"✓ OCR extracted {total_ocr_chars} characters from {len(ocr_results)} tabs")
+                scraper_log.info("✓ OCR extracted %s characters from %s tabs", total_ocr_chars, len(ocr_results))
 
         except Exception as e:
-            print(f"Error exploring navigation: {e}")
+            scraper_log.error("Error exploring navigation: %s", e)
 
-        return explored, ocr_results if enable_ocr else (explored, [])
+        return explored, ocr_results, tab_views, ocr_skipped
     
-    def extract_all_data(self, explore_nav=True, enable_scrolling=False, enable_ocr=False) -> Dict[str, Any]:
+    def extract_all_data(self, explore_nav=True, enable_scrolling=False, enable_ocr=False,
+                         ocr_min_dom_items=None) -> Dict[str, Any]:
         """Extract all data from the dashboard
 
         Args:
             explore_nav: Whether to click through navigation tabs (default: True)
             enable_scrolling: Whether to scroll pages to load lazy content (default: False)
             enable_ocr: Whether to run OCR on screenshots (default: False)
+            ocr_min_dom_items: If set, skip OCR on each view (initial view or tab) whose
+                DOM exposes at least this many tables + metrics + labelled charts and
+                no canvas charts (default: always OCR)
         """
-        print("Starting data extraction...")
+        scraper_log.info("Starting data extraction...")
 
         # Wait for dashboard to load
         self.wait_for_dashboard_load()
@@ -776,7 +920,7 @@ class LookerStudioExtractor:
         self.quick_scroll()
 
         # Extract all data types from initial view
-        print("📊 Extracting from initial view...")
+        scraper_log.info("📊 Extracting from initial view...")
         data = {
             'metadata': self.extract_page_metadata(),
             'tables': self.extract_tables(),
@@ -786,63 +930,62 @@ class LookerStudioExtractor:
             'ocr_text': []  # Store OCR text from each page
         }
 
-        # Run OCR on initial view (OPTIONAL - disabled by default)
-        ocr_chars = 0
-        if enable_ocr:
+        # OCR is by far the slowest step; each view (the initial one and every tab)
+        # is only OCR'd when its own DOM doesn't already expose the data
+        data['ocr_skipped'] = []
+
+        # Run OCR on initial view (OPTIONAL - disabled by default); it runs in the
+        # background while the navigation tabs are explored
+        initial_ocr = None
+        if enable_ocr and not self.view_needs_ocr(data, ocr_min_dom_items):
+            scraper_log.info("   DOM exposes the data on the initial view, skipping OCR")
+            data['ocr_skipped'].append('initial_view')
+        elif enable_ocr:
             try:
-                ocr_result = self.extract_text_via_ocr()
-                if ocr_result.get('extracted_text'):
-                    data['ocr_text'].append({
-                        'source': 'initial_view',
-                        'text': ocr_result['extracted_text'],
-                        'char_count': ocr_result.get('character_count', 0)
-                    })
-                    ocr_chars = ocr_result.get('character_count', 0)
+                initial_ocr = self.submit_ocr()
             except Exception as ocr_error:
-                print(f"     Warning: OCR failed on initial view: {ocr_error}")
-                print("     Continuing without OCR...")
+                scraper_log.warning("     Warning: OCR failed on initial view: %s", ocr_error)
+                scraper_log.info("     Continuing without OCR...")
 
         initial_count = {
             'tables': len(data['tables']),
             'metrics': len(data['metrics']),
-            'charts': len(data['charts']),
-            'ocr_chars': ocr_chars
+            'charts': len(data['charts'])
         }
-        print(f"   Initial: {initial_count['tables']} tables, {initial_count['metrics']} metrics, {initial_count['charts']} charts, {initial_count['ocr_chars']} chars via OCR")
+        scraper_log.info("   Initial: %s tables, %s metrics, %s charts", initial_count['tables'], initial_count['metrics'], initial_count['charts'])
 
         # Explore navigation if requested
+        tab_ocr_results, tab_views = [], []
         if explore_nav:
-            print("\n🗂️  Exploring navigation tabs...")
-            navigation_result = self.explore_navigation(enable_ocr=enable_ocr)
-
-            # Handle both old and new return formats
-            if enable_ocr and isinstance(navigation_result, tuple):
-                data['navigation_explored'], tab_ocr_results = navigation_result
-                # Add OCR results from each tab
-                if tab_ocr_results:
-                    data['ocr_text'].extend(tab_ocr_results)
-                    total_tab_ocr = sum(r.get('char_count', 0) for r in tab_ocr_results)
-                    print(f"   Total OCR from tabs: {total_tab_ocr} characters from {len(tab_ocr_results)} tabs")
-            else:
-                data['navigation_explored'] = navigation_result if not isinstance(navigation_result, tuple) else navigation_result[0]
+            scraper_log.info("\n🗂️  Exploring navigation tabs...")
+            data['navigation_explored'], tab_ocr_results, tab_views, tab_ocr_skipped = self.explore_navigation(
+                enable_ocr=enable_ocr,
+                ocr_min_dom_items=ocr_min_dom_items
+            )
+            data['ocr_skipped'].extend(tab_ocr_skipped)
+
+        if initial_ocr is not None:
+            ocr_chars = self._add_ocr_result(data['ocr_text'], 'initial_view', initial_ocr)
+            scraper_log.info("   Initial view: %s chars via OCR", ocr_chars)
+
+        # Add OCR results from each tab
+        if tab_ocr_results:
+            data['ocr_text'].extend(tab_ocr_results)
+            total_tab_ocr = sum(r.get('char_count', 0) for r in tab_ocr_results)
+            scraper_log.info("   Total OCR from tabs: %s characters from %s tabs", total_tab_ocr, len(tab_ocr_results))
 
+        if explore_nav:
             if data['navigation_explored']:
-                print(f"\n📊 Re-extracting data after exploring {len(data['navigation_explored'])} tabs...")
-
-                # Re-extract data after navigation
-                new_tables = self.extract_tables()
-                new_metrics = self.extract_metrics()
-                new_charts = self.extract_charts()
-
-                print(f"   Found: {len(new_tables)} tables, {len(new_metrics)} metrics, {len(new_charts)} charts")
+                scraper_log.info("\n📊 Merging data from %s tabs...", len(data['navigation_explored']))
 
-                # Add new data
-                data['tables'].extend(new_tables)
-                data['metrics'].extend(new_metrics)
-                data['charts'].extend(new_charts)
+                # Add the data each tab exposed in its DOM
+                for view in tab_views:
+                    data['tables'].extend(view['tables'])
+                    data['metrics'].extend(view['metrics'])
+                    data['charts'].extend(view['charts'])
 
                 # Remove duplicates
-                print("   Removing duplicates...")
+                scraper_log.info("   Removing duplicates...")
                 data['tables'] = self._deduplicate_list(data['tables'])
                 data['metrics'] = self._deduplicate_list(data['metrics'])
                 data['charts'] = self._deduplicate_list(data['charts'])
@@ -859,9 +1002,9 @@ class LookerStudioExtractor:
                     'charts': final_count['charts'] - initial_count['charts']
                 }
 
-                print(f"   Added from tabs: +{added['tables']} tables, +{added['metrics']} metrics, +{added['charts']} charts")
+                scraper_log.info("   Added from tabs: +%s tables, +%s metrics, +%s charts", added['tables'], added['metrics'], added['charts'])
             else:
-                print("   No navigation tabs found to explore")
+                scraper_log.info("   No navigation tabs found to explore")
 
         # Add summary
         total_ocr_chars = sum(item.get('char_count', 0) for item in data.get('ocr_text', []))
@@ -874,7 +1017,7 @@ class LookerStudioExtractor:
             'total_ocr_characters': total_ocr_chars
         }
 
-        print(f"\n✓ Extraction complete: {data['summary']}")
+        scraper_log.info("\n✓ Extraction complete: %s", data['summary'])
 
         return data
     
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Database migration: Add indexes for live session lookups
+
+db.create_all() only creates indexes for new tables, so existing databases
+need this once. Works with SQLite and PostgreSQL (DATABASE_URL).
+"""
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+# Same default as the app (Flask-SQLAlchemy puts relative SQLite paths in instance/)
+DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///instance/supa_reports.db')
+
+INDEXES = [
+    ('ix_sessions_active_last_active', 'sessions', 'is_active, last_active'),
+]
+
+def migrate():
+    """Create the indexes if they don't exist yet"""
+    engine = create_engine(DATABASE_URL)
+    # CONCURRENTLY avoids locking the tables on PostgreSQL but can't run in a transaction
+    concurrently = 'CONCURRENTLY ' if engine.dialect.name == 'postgresql' else ''
+
+    try:
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            for name, table, columns in INDEXES:
+                print(f"Creating index {name} on {table} ({columns})...")
+                conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({columns})"))
+                print(f"✓ {name} ready")
+
+        print()
+        print("=" * 60)
+        print("✓ Migration completed successfully!")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        engine.dispose()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Database migration: Store verification and password reset tokens as SHA-256 hashes
+
+Adds the verification_token_hash / reset_token_hash columns and their indexes,
+hashes any outstanding tokens so links already emailed keep working, then clears
+the cleartext columns. Works with SQLite and PostgreSQL (DATABASE_URL).
+
+Idempotent: app.py runs it on every startup against the app's own engine, since
+db.create_all() doesn't add columns to an existing users table.
+"""
+import os
+import hashlib
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, inspect, text, LargeBinary
+
+load_dotenv()
+
+# Same default as the app (Flask-SQLAlchemy puts relative SQLite paths in instance/)
+DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///instance/supa_reports.db')
+
+# (cleartext column, hash column, index name, unique)
+TOKEN_COLUMNS = [
+    ('verification_token', 'verification_token_hash', 'ix_users_verification_token_hash', True),
+    ('reset_token', 'reset_token_hash', 'ix_users_reset_token_hash', False),
+]
+
+def migrate(engine=None, log=print):
+    """
+    Add the hash columns, move existing tokens over and index them
+
+    Args:
+        engine: Engine to migrate (default: a new one for DATABASE_URL)
+        log: Callable for progress messages
+
+    Returns:
+        True if the schema is up to date, False if the migration failed
+    """
+    own_engine = engine is None
+    if own_engine:
+        engine = create_engine(DATABASE_URL)
+    binary_type = LargeBinary(32).compile(dialect=engine.dialect)
+
+    try:
+        inspector = inspect(engine)
+        columns = [col['name'] for col in inspector.get_columns('users')]
+        # Columns that already have an index or unique constraint (e.g. from create_all)
+        indexed = {tuple(ix['column_names']) for ix in inspector.get_indexes('users')}
+        indexed |= {tuple(uc['column_names']) for uc in inspector.get_unique_constraints('users')}
+
+        with engine.begin() as conn:
+            for token_column, hash_column, _, _ in TOKEN_COLUMNS:
+                if hash_column not in columns:
+                    log(f"Adding {hash_column} column...")
+                    conn.execute(text(f"ALTER TABLE users ADD COLUMN {hash_column} {binary_type}"))
+                    log(f"✓ Added {hash_column} column")
+                else:
+                    log(f"✓ {hash_column} column already exists")
+
+                if token_column not in columns:
+                    continue
+
+                rows = conn.execute(text(
+                    f"SELECT id, {token_column} FROM users WHERE {token_column} IS NOT NULL"
+                )).fetchall()
+                for user_id, token in rows:
+                    conn.execute(
+                        text(f"UPDATE users SET {hash_column} = :hash, {token_column} = NULL WHERE id = :id"),
+                        {'hash': hashlib.sha256(token.encode()).digest(), 'id': user_id}
+                    )
+                log(f"✓ Hashed {len(rows)} outstanding {token_column} value(s)")
+
+        for _, hash_column, index_name, unique in TOKEN_COLUMNS:
+            if (hash_column,) in indexed:
+                log(f"✓ {hash_column} already indexed")
+                continue
+            log(f"Creating index {index_name}...")
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} ON users ({hash_column})"
+                ))
+            log(f"✓ {index_name} ready")
+
+        log("✓ Token hash migration completed successfully")
+        return True
+
+    except Exception as e:
+        log(f"❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        if own_engine:
+            engine.dispose()
+
+if __name__ == "__main__":
+    migrate()
@@ -3,11 +3,33 @@ Database models for Supa Reports authentication and activity tracking
 """
 from datetime import datetime, timedelta
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+import os
+import hmac
+import hashlib
 import secrets
+import logging
+import threading
+import time
 
-db = SQLAlchemy()
+logger = logging.getLogger(__name__)
+
+# Keep loaded attributes after commit; each request gets a fresh session anyway,
+# so expiring them only forces extra SELECTs on current_user and friends
+db = SQLAlchemy(session_options={'expire_on_commit': False})
+
+# PBKDF2 work factor for new password hashes. Werkzeug's default (1,000,000)
+# costs most of a second of CPU per login; 600,000 is the OWASP recommendation
+# for PBKDF2-SHA256. Existing hashes keep the iteration count stored in them.
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '600000'))
+
+
+def hash_token(token):
+    """SHA-256 digest under which emailed verification/reset tokens are stored"""
+    return hashlib.sha256(token.encode()).digest()
 
 
 class User(UserMixin, db.Model):
@@ -19,8 +41,10 @@ class User(UserMixin, db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     username = db.Column(db.String(80), unique=True, nullable=True)
     verified = db.Column(db.Boolean, default=False, nullable=False)
-    verification_token = db.Column(db.String(255), unique=True, nullable=True)
-    reset_token = db.Column(db.String(255), nullable=True)
+    # Only SHA-256 digests of emailed tokens are stored: a leaked table can't be used
+    # to verify or reset accounts, and the fixed 32-byte keys keep the indexes small
+    verification_token_hash = db.Column(db.LargeBinary(32), unique=True, nullable=True)
+    reset_token_hash = db.Column(db.LargeBinary(32), nullable=True, index=True)
     reset_token_expires = db.Column(db.DateTime, nullable=True)
     profile_picture = db.Column(db.String(255), default='/static/avatars/default-1.png')
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -34,26 +58,28 @@ class User(UserMixin, db.Model):
 
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = generate_password_hash(password, method=f'pbkdf2:sha256:{PASSWORD_HASH_ITERATIONS}')
 
     def check_password(self, password):
         """Verify password against hash"""
         return check_password_hash(self.password_hash, password)
 
     def generate_verification_token(self):
-        """Generate unique verification token"""
-        self.verification_token = secrets.token_urlsafe(32)
-        return self.verification_token
+        """Generate unique verification token (only its hash is stored)"""
+        token = secrets.token_urlsafe(32)
+        self.verification_token_hash = hash_token(token)
+        return token
 
     def generate_reset_token(self, expires_in_hours=24):
-        """Generate password reset token with expiration"""
-        self.reset_token = secrets.token_urlsafe(32)
+        """Generate password reset token with expiration (only its hash is stored)"""
+        token = secrets.token_urlsafe(32)
+        self.reset_token_hash = hash_token(token)
         self.reset_token_expires = datetime.utcnow() + timedelta(hours=expires_in_hours)
-        return self.reset_token
+        return token
 
     def verify_reset_token(self, token):
         """Verify reset token is valid and not expired"""
-        if not self.reset_token or self.reset_token != token:
+        if not self.reset_token_hash or not hmac.compare_digest(self.reset_token_hash, hash_token(token)):
             return False
         if not self.reset_token_expires or datetime.utcnow() > self.reset_token_expires:
             return False
@@ -61,7 +87,7 @@ class User(UserMixin, db.Model):
 
     def clear_reset_token(self):
         """Clear reset token after use"""
-        self.reset_token = None
+        self.reset_token_hash = None
         self.reset_token_expires = None
 
     def get_active_session(self):
@@ -75,6 +101,10 @@ class User(UserMixin, db.Model):
 class Session(db.Model):
     """User session tracking"""
     __tablename__ = 'sessions'
+    __table_args__ = (
+        # Range scans for live sessions (online users, session counts)
+        db.Index('ix_sessions_active_last_active', 'is_active', 'last_active'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
@@ -95,15 +125,147 @@ class Session(db.Model):
         self.last_active = datetime.utcnow()
         db.session.commit()
 
-    def deactivate(self):
-        """Mark session as inactive"""
+    def deactivate(self, commit=True):
+        """Mark session as inactive (commit=False leaves committing to the caller)"""
         self.is_active = False
-        db.session.commit()
+        if commit:
+            db.session.commit()
 
     def __repr__(self):
         return f'<Session {self.session_token[:8]}... User:{self.user_id}>'
 
 
+class SessionActivityWriter:
+    """
+    Track user activity in memory and batch last_active updates to the database
+
+    Requests record a user's latest activity in a dict (at most once per
+    min_interval seconds per user) and a background thread writes the
+    pending timestamps to each user's latest session in a single executemany
+    UPDATE every flush_interval seconds.
+
+    If idle_timeout is set, sessions without activity for that many seconds
+    are marked inactive, so abandoned sessions (no logout) expire on their
+    own like TTL'd keys. A user who comes back has their latest session
+    reactivated by the next flush.
+
+    The in-memory timestamps double as the "who is online" view once the
+    writer has been tracking for long enough (see active_since()); this
+    assumes a single app process, as with waitress.
+    """
+
+    def __init__(self, app, flush_interval=5, min_interval=60, idle_timeout=None):
+        self.app = app
+        self.flush_interval = flush_interval
+        self.min_interval = min_interval
+        self.idle_timeout = idle_timeout
+        self._last_seen = {}  # user_id -> last recorded activity
+        self._pending = {}  # user_id -> activity not yet written
+        self._last_expiry = 0.0
+        self._started = datetime.utcnow()
+        self._lock = threading.Lock()
+        # Held for a whole flush (take + write), so forget() can't slip in between
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='session-activity-writer', daemon=True)
+        self._thread.start()
+
+    def touch(self, user_id):
+        """Record activity for a user (throttled to once per min_interval)"""
+        now = datetime.utcnow()
+        with self._lock:
+            last_seen = self._last_seen.get(user_id)
+            if last_seen and (now - last_seen).total_seconds() < self.min_interval:
+                return
+            self._last_seen[user_id] = now
+            self._pending[user_id] = now
+
+    def last_seen(self, user_id):
+        """Most recent activity recorded by this process for a user, if any"""
+        with self._lock:
+            return self._last_seen.get(user_id)
+
+    def forget(self, user_id):
+        """
+        Drop a user's tracked activity (on logout) so a flush can't revive their session
+
+        Waits for a flush that is already writing, since it may have taken the
+        user's activity before this call. Deactivate the session afterwards, so
+        that write comes last.
+        """
+        with self._flush_lock, self._lock:
+            self._last_seen.pop(user_id, None)
+            self._pending.pop(user_id, None)
+
+    def active_since(self, cutoff):
+        """
+        Users with activity at or after cutoff, as {user_id: last activity}
+
+        Returns None if tracking started after cutoff (e.g. just after a
+        restart), since activity before then was never seen by this process.
+        """
+        if self._started > cutoff:
+            return None
+        with self._lock:
+            return {user_id: last_seen for user_id, last_seen in self._last_seen.items()
+                    if last_seen >= cutoff}
+
+    def flush(self):
+        """Write all pending activity in one transaction"""
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        """Take the pending activity and write it (with _flush_lock held)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return
+
+        with self.app.app_context():
+            try:
+                db.session.execute(
+                    text("UPDATE sessions SET last_active = :last_active, is_active = :is_active "
+                         "WHERE id = (SELECT MAX(id) FROM sessions WHERE user_id = :user_id)"),
+                    [{'user_id': user_id, 'last_active': last_active, 'is_active': True}
+                     for user_id, last_active in pending.items()]
+                )
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Error flushing session activity: %s", e)
+
+    def expire_idle(self):
+        """Mark sessions idle for longer than idle_timeout as inactive"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.idle_timeout)
+
+        # Users who went idle are no longer online; don't keep an entry per user forever
+        with self._lock:
+            self._last_seen = {user_id: last_seen for user_id, last_seen in self._last_seen.items()
+                               if last_seen >= cutoff}
+
+        with self.app.app_context():
+            try:
+                db.session.execute(
+                    text("UPDATE sessions SET is_active = :inactive "
+                         "WHERE is_active = :active AND last_active < :cutoff"),
+                    {'inactive': False, 'active': True, 'cutoff': cutoff}
+                )
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Error expiring idle sessions: %s", e)
+
+    def _run(self):
+        """Flush pending updates (and expire idle sessions once a minute) forever"""
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            if self.idle_timeout and time.monotonic() - self._last_expiry >= 60:
+                self._last_expiry = time.monotonic()
+                self.expire_idle()
+
+
 class ActivityLog(db.Model):
     """User activity tracking"""
     __tablename__ = 'activity_logs'
@@ -154,6 +316,19 @@ class UserStats(db.Model):
         return f'<UserStats User:{self.user_id} Reports:{self.reports_count}>'
 
 
+class ReportCache(db.Model):
+    """Cached report generation responses keyed by a hash of their inputs"""
+    __tablename__ = 'report_cache'
+
+    cache_key = db.Column(db.String(64), primary_key=True)  # SHA-256 hex digest
+    payload = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed JSON response
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<ReportCache {self.cache_key[:8]}... expires {self.expires_at}>'
+
+
 def init_db(app):
     """Initialize database with app context"""
     db.init_app(app)
@@ -162,6 +337,25 @@ def init_db(app):
         print("✓ Database tables created")
 
 
+def ensure_user_stats(user_id):
+    """
+    Create a user's stats row if it doesn't exist, as part of the current transaction
+
+    Uses INSERT ... ON CONFLICT DO NOTHING, so there is no SELECT first and
+    concurrent logins of the same user can't both insert.
+    """
+    dialects = {'postgresql': postgresql, 'sqlite': sqlite}
+    dialect = dialects.get(db.session.get_bind().dialect.name)
+    if dialect is None:
+        if db.session.get(UserStats, user_id) is None:
+            db.session.add(UserStats(user_id=user_id))
+        return
+
+    db.session.execute(
+        dialect.insert(UserStats).values(user_id=user_id).on_conflict_do_nothing(index_elements=['user_id'])
+    )
+
+
 def log_activity(user_id, action_type, details=None, resource_id=None):
     """
     Helper function to log user activity and update stats
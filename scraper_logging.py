@@ -0,0 +1,25 @@
+"""
+Non-blocking progress output for dashboard and web page scraping
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+# Scrapes run on several browser threads at once; they hand their messages to a
+# queue and a single listener thread writes them out, so workers never contend
+# for (or block on) stdout
+scraper_log = logging.getLogger('supareports.scraper')
+scraper_log.setLevel(logging.INFO)
+scraper_log.propagate = False
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(logging.Formatter('%(message)s'))
+
+_log_queue = queue.SimpleQueue()
+scraper_log.addHandler(logging.handlers.QueueHandler(_log_queue))
+
+scraper_log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+scraper_log_listener.start()
+atexit.register(scraper_log_listener.stop)
@@ -0,0 +1,126 @@
+"""
+Reusable authenticated SMTP connections for the email fallback path
+"""
+import atexit
+import logging
+import queue
+import smtplib
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPool:
+    """
+    Keep logged-in SMTP connections around between sends
+
+    Opening a connection costs a TCP connect, STARTTLS and AUTH before any
+    message bytes move; connections are reused until they have been idle
+    for max_idle seconds. STARTTLS on the configured port is tried first,
+    then implicit TLS on ssl_port.
+    """
+
+    def __init__(self, host, port, username, password, ssl_port=465, timeout=10, max_idle=90):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.ssl_port = ssl_port
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()  # (connection, last used) - most recent first
+
+    def _connect(self):
+        """Open and authenticate a new connection"""
+        try:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                server.starttls()
+                server.login(self.username, self.password)
+            except Exception:
+                server.close()
+                raise
+            logger.info("Opened SMTP connection to %s:%s", self.host, self.port)
+        except (smtplib.SMTPException, TimeoutError, OSError) as e:
+            logger.warning("SMTP port %s failed (%s), trying SSL on port %s", self.port, e, self.ssl_port)
+            server = smtplib.SMTP_SSL(self.host, self.ssl_port, timeout=self.timeout)
+            try:
+                server.login(self.username, self.password)
+            except Exception:
+                server.close()
+                raise
+            logger.info("Opened SMTP SSL connection to %s:%s", self.host, self.ssl_port)
+        return server
+
+    def acquire(self):
+        """Take an idle connection, or open one if there is none"""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < self.max_idle:
+                return server
+            self.discard(server)
+
+    def release(self, server):
+        """Return a healthy connection for reuse"""
+        self._idle.put((server, time.monotonic()))
+
+    def discard(self, server):
+        """Close a connection that is broken or no longer needed"""
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def send(self, msg, from_addr, to_addrs):
+        """Send msg over a pooled connection, reconnecting once if the server dropped it"""
+        server = self.acquire()
+        try:
+            try:
+                server.send_message(msg, from_addr, to_addrs)
+            except smtplib.SMTPServerDisconnected:
+                # Idle connection was closed on the server side
+                server.close()
+                server = self._connect()
+                server.send_message(msg, from_addr, to_addrs)
+        except Exception:
+            self.discard(server)
+            raise
+        self.release(server)
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(server)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(host, port, username, password):
+    """Shared pool for a (username, host, port), created on first use"""
+    key = (username, host, port)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SMTPPool(host, port, username, password)
+        return pool
+
+
+def close_smtp_pools():
+    """Close the idle connections of every pool (at exit)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_smtp_pools)
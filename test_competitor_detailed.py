@@ -23,7 +23,7 @@ def main():
     print()
 
     # Fetch and format insights
-    insights = fetch_competitor_insights(test_urls)
+    insights, _ = fetch_competitor_insights(test_urls)
 
     if insights:
         print("\n" + "=" * 80)
@@ -41,7 +41,7 @@ def main():
     # Test 2: Multiple URLs with formatting
     print("TEST 2: Fetching multiple URLs with formatting")
     print("-" * 80)
-    insights = fetch_competitor_insights(test_urls)
+    insights, _ = fetch_competitor_insights(test_urls)
 
     if insights:
         print("✓ Formatted insights generated!")
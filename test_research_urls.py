@@ -42,7 +42,7 @@ def main():
     print("🔍 Fetching research insights...")
     print()
 
-    insights = fetch_competitor_insights(research_urls)
+    insights, _ = fetch_competitor_insights(research_urls)
 
     if insights:
         print("\n" + "=" * 80)